@@ -3,19 +3,28 @@ from .mining_utils import *
 from .cleaning_utils import *
 from .feature_engineering_utils import *
 from .embedding_utils import *
+from .pipeline_utils import *
 from .logging_utils import configure_logging
 from . import util
 
 
 __all__ = [
     # logging
-    "configure_logging"
+    "configure_logging",
     # mining utils
+    "UniProtClient",
+    "AccessionIndex",
+    "UniProtRecordStore",
     "extract_accessions_from_humann",
     "extract_all_accessions_from_dir",
     "fetch_uniprotkb_fields",
+    "fetch_uniprotkb_fields_to_parquet",
     "fetch_save_uniprotkb_batches",
+    "read_uniprotkb_dataset",
+    "uniprotkb_dataset_prefixes",
     # cleaning utils
+    "CleaningMemo",
+    "TokenVocabulary",
     "clean_col", 
     "clean_cols",
     # embedding utils
@@ -23,7 +32,8 @@ __all__ = [
     "GOEncoder",
     "FreeTXTEmbedder",
     "AAChainEmbedder",
-    "ECEncoder"
+    "SequenceEmbeddingCache",
+    "ECEncoder",
     # feature engineering utils
     "embed_ft_domains",
     "embed_AAsequences",
@@ -31,9 +41,14 @@ __all__ = [
     "encode_go",
     "encode_ec",
     "encode_multihot",
+    "fit_go_term_counts",
+    "fit_ec_term_counts",
     "empty_tuples_to_NaNs",
     "save_df",
-    "load_df"
+    "load_df",
+    # pipeline utils
+    "StreamingPreprocessor",
+    "load_streamed_df",
     # util
     "util"
 ]
@@ -2,7 +2,8 @@
 import os
 import sys
 import logging
-from typing import List, Union, Tuple, Dict, Optional
+import hashlib
+from typing import List, Union, Tuple, Dict, Optional, Mapping
 import sqlite3
 import atexit
 from collections import OrderedDict
@@ -15,6 +16,8 @@ from openai import OpenAI
 from sklearn.preprocessing import MultiLabelBinarizer
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import importlib
 
 # local:
@@ -50,9 +53,135 @@ def silent_transformers():
 _logger = logging.getLogger(__name__)
 GODag = get_GODag()
 
+
+class _EarlyExit(Exception):
+    """Raised by the forward hook once the representation layer has run."""
+
 # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 #                           DENSE EMBEDDINGS
 # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=	
+class SequenceEmbeddingCache:
+    """
+    Persistent, content-addressed store of pooled sequence embeddings.
+
+    Vectors of one namespace (e.g. model, representation layer and dtype) are appended
+    as float32 rows to `<cache_dir>/<namespace>.f32`; `<cache_dir>/index.sqlite` maps
+    (namespace, SHA-256 of the sequence) → row. Rows are never rewritten and are indexed
+    only once written, so a crash can at most leave unindexed trailing rows and a torn
+    partial row; reads ignore the torn tail and the next `put` truncates it. Meant for
+    one writing process at a time.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the vector files and the index (created if missing).
+    """
+
+    INDEX_FILE_NAME = "index.sqlite"
+    _QUERY_CHUNK = 500 # hashes per SELECT ... IN (...)
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self._conn = sqlite3.connect(os.path.join(cache_dir, self.INDEX_FILE_NAME))
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS namespaces (
+                namespace TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS vectors (
+                namespace TEXT NOT NULL,
+                seq_hash BLOB NOT NULL,
+                row INTEGER NOT NULL,
+                PRIMARY KEY (namespace, seq_hash)
+            ) WITHOUT ROWID;
+        """)
+        self._conn.commit()
+        atexit.register(self.close)
+        _logger.debug("Sequence embedding cache opened at %s", cache_dir)
+
+    # ---------PROTECTED---------
+    @staticmethod
+    def _hash(seq: str) -> bytes:
+        return hashlib.sha256(seq.encode("utf-8")).digest()
+
+    def _vector_path(self, namespace: str) -> str:
+        return os.path.join(self.cache_dir, namespace.replace(os.sep, "-") + ".f32")
+
+    def _check_dim(self, namespace: str, dim: int) -> None:
+        row = self._conn.execute("SELECT dim FROM namespaces WHERE namespace = ?", (namespace,)).fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO namespaces VALUES (?, ?)", (namespace, dim))
+            self._conn.commit()
+        elif row[0] != dim:
+            raise ValueError(f"Cache namespace '{namespace}' holds {row[0]}-d vectors, not {dim}-d")
+
+    def _rows(self, namespace: str, hashes: List[bytes]) -> Dict[bytes, int]:
+        found: Dict[bytes, int] = {}
+        for start in range(0, len(hashes), self._QUERY_CHUNK):
+            chunk = hashes[start:start + self._QUERY_CHUNK]
+            found.update(self._conn.execute(
+                f"SELECT seq_hash, row FROM vectors WHERE namespace = ? AND seq_hash IN ({','.join('?' * len(chunk))})",
+                (namespace, *chunk)
+            ))
+        return found
+
+    # ---------PUBLIC---------
+    def get(self, namespace: str, seqs: List[str], dim: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look `seqs` up; returns a boolean hit mask and the ``(hits, dim)`` float32
+        vectors of the hits, in input order.
+        """
+        self._check_dim(namespace, dim)
+        hashes = [self._hash(s) for s in seqs]
+        found = self._rows(namespace, list(set(hashes)))
+        hit = np.fromiter((h in found for h in hashes), dtype=bool, count=len(hashes))
+        if not found:
+            return hit, np.empty((0, dim), dtype=np.float32)
+        path = self._vector_path(namespace)
+        n_rows = os.path.getsize(path) // (dim * np.dtype(np.float32).itemsize) # whole rows only
+        stored = np.memmap(path, dtype=np.float32, mode="r", shape=(n_rows, dim))
+        return hit, np.array(stored[[found[h] for h, is_hit in zip(hashes, hit) if is_hit]])
+
+    def put(self, namespace: str, seqs: List[str], vectors: np.ndarray) -> int:
+        """Append the vectors of `seqs` not cached yet; returns how many were added."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        self._check_dim(namespace, dim)
+        hashes = [self._hash(s) for s in seqs]
+        known = self._rows(namespace, list(set(hashes)))
+        new = {}
+        for i, h in enumerate(hashes):
+            if h not in known and h not in new:
+                new[h] = i
+        if not new:
+            return 0
+
+        row_bytes = dim * vectors.itemsize
+        with open(self._vector_path(namespace), "ab") as f:
+            size = f.tell()
+            if size % row_bytes: # a torn write from an interrupted run
+                f.truncate(size - size % row_bytes)
+                size -= size % row_bytes
+            first_row = size // row_bytes
+            f.write(vectors[list(new.values())].tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._conn.executemany("INSERT INTO vectors VALUES (?, ?, ?)",
+                               [(namespace, h, first_row + k) for k, h in enumerate(new)])
+        self._conn.commit()
+        return len(new)
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+
 class AAChainEmbedder:
     """
     Mean-pooled ESM-2 sequence encoder.
@@ -76,6 +205,19 @@ class AAChainEmbedder:
         Precision override for model weights. ``None`` keeps HF default.
     representation_layer : {'last', 'second_to_last', int}
         Which hidden layer to pool.
+    max_tokens : int | None
+        Default padded-token budget per forward pass, see `embed_sequences`.
+    early_exit : bool, default True
+        Stop every forward pass once `representation_layer` has run and keep only its
+        states, instead of running all layers and returning every hidden state.
+    cache_dir : str | None
+        Directory of a `SequenceEmbeddingCache`; sequences already embedded with the same
+        model, representation layer and dtype are read from it instead of recomputed.
+    long_sequences : {'truncate', 'window'}
+        Sequences longer than ``max_position_embeddings - 2`` residues are either truncated
+        or embedded whole as overlapping windows, see `embed_matrix`.
+    window_overlap : int, default 128
+        Residues shared by consecutive windows in ``'window'`` mode.
     """
 
     HF_MODELS: Dict[str, str] = {
@@ -86,6 +228,7 @@ class AAChainEmbedder:
         "esm2_t12_35M_UR50D":  "facebook/esm2_t12_35M_UR50D",
         "esm2_t6_8M_UR50D":    "facebook/esm2_t6_8M_UR50D",
     }
+    LONG_SEQUENCE_MODES = {"truncate", "window"}
 
     def __init__(
         self,
@@ -93,14 +236,27 @@ class AAChainEmbedder:
         device: str = "cpu",
         dtype: Union[torch.dtype, None] = None,
         representation_layer: Union[int, str] = "second_to_last",
+        max_tokens: Optional[int] = None,
+        early_exit: bool = True,
+        cache_dir: Optional[str] = None,
+        long_sequences: str = "truncate",
+        window_overlap: int = 128,
     ):
         _logger.info(
-            "Initialising AAChainEmbedder(model_key=%s, device=%s, dtype=%s, repr_layer=%s)",
-            model_key, device, dtype, representation_layer,
+            "Initialising AAChainEmbedder(model_key=%s, device=%s, dtype=%s, repr_layer=%s, max_tokens=%s, "
+            "early_exit=%s, cache_dir=%s, long_sequences=%s)", model_key, device, dtype, representation_layer,
+            max_tokens, early_exit, cache_dir, long_sequences,
         )
         if model_key not in self.HF_MODELS:
             raise ValueError(f"`model_key` must be one of {list(self.HF_MODELS)}")
-
+        if long_sequences not in self.LONG_SEQUENCE_MODES:
+            raise ValueError(f"long_sequences must be one of {self.LONG_SEQUENCE_MODES}")
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"max_tokens must be a positive integer, received {max_tokens}")
+        self.max_tokens = max_tokens
+        self.early_exit = early_exit
+
+        self.model_key = model_key
         self.repo_id = self.HF_MODELS[model_key]
 
         self.tokenizer = AutoTokenizer.from_pretrained(self.repo_id, use_fast=False)
@@ -127,46 +283,179 @@ class AAChainEmbedder:
         )
         if not (0 <= self.repr_idx < n_layers):
             raise ValueError(f"representation_layer must be in [0,{n_layers-1}] or a valid alias")
+
+        window = self.model.config.max_position_embeddings - 2
+        if long_sequences == "window" and not (0 <= window_overlap < window):
+            raise ValueError(f"window_overlap must be in [0,{window - 1}], received {window_overlap}")
+        self.long_sequences = long_sequences
+        self.window_overlap = window_overlap
+
+        self.cache = SequenceEmbeddingCache(cache_dir) if cache_dir is not None else None
         
         _logger.debug("AAChainEmbedder initialised: repr_idx=%d, max_len=%d", self.repr_idx,
                       self.model.config.max_position_embeddings)
 
     # ------------------------------------------------------------
+    @property
+    def cache_namespace(self) -> str:
+        """Cache key prefix: vectors are only reused for the same model, layer, dtype (and windowing)."""
+        namespace = f"{self.model_key}-layer{self.repr_idx}-{str(self.model.dtype).replace('torch.', '')}"
+        if self.long_sequences == "window":
+            namespace += f"-window{self.window_overlap}"
+        return namespace
+
+    def _repr_states(self, toks) -> torch.Tensor:
+        """Hidden states [B, L, D] of layer `repr_idx` (`hidden_states[repr_idx]` of a full pass)."""
+        if not self.early_exit:
+            return self.model(
+                **toks, output_hidden_states=True # returns all layer outputs.
+            ).hidden_states[self.repr_idx]
+
+        # hidden_states[0] is the embedding output, hidden_states[k] the output of layer k-1
+        source = self.model.embeddings if self.repr_idx == 0 else self.model.encoder.layer[self.repr_idx - 1]
+        captured = {}
+
+        def stop(module, args, output):
+            captured["states"] = output[0] if isinstance(output, tuple) else output
+            raise _EarlyExit
+
+        handle = source.register_forward_hook(stop)
+        try:
+            self.model(**toks)
+        except _EarlyExit:
+            pass
+        finally:
+            handle.remove()
+        return captured["states"]
+
+    @staticmethod
+    def _window_starts(length: int, window: int, overlap: int) -> List[int]:
+        """Starts of the windows covering `length` residues; the last one ends at the last residue."""
+        if length <= window:
+            return [0]
+        return list(range(0, length - window, window - overlap)) + [length - window]
+
+    @staticmethod
+    def _length_batches(lengths: List[int], batch_size: int, max_tokens: Optional[int] = None) -> List[List[int]]:
+        """
+        Group indices of `lengths` into batches of similar length, longest first.
+
+        A batch holds at most `batch_size` sequences and, with `max_tokens`, at most that
+        many padded tokens (members × longest member incl. BOS/EOS); a sequence longer
+        than the budget gets a batch of its own.
+        """
+        order = sorted(range(len(lengths)), key=lambda i: -lengths[i]) # stable
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        for i in order:
+            # batch[0] is the longest member, so it sets the padded length
+            if batch and (len(batch) == batch_size or (
+                    max_tokens is not None and (len(batch) + 1) * (lengths[batch[0]] + 2) > max_tokens)):
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if batch:
+            batches.append(batch)
+        return batches
+
     @torch.no_grad()
-    def embed_sequences(self, seqs: List[str], batch_size: int = 32) -> List[np.ndarray]:
+    def embed_matrix(
+        self, seqs: List[str], batch_size: int = 32, max_tokens: Optional[int] = None,
+        out_path: Optional[str] = None
+    ) -> np.ndarray:
         """
-        Return a mean-pooled embedding for every sequence.
+        Mean-pooled embeddings of `seqs` as one ``(len(seqs), hidden_dim)`` float32 matrix.
+
+        Sequences are sorted by length and batched with their neighbours, so little
+        compute goes to padding; row `i` always belongs to `seqs[i]`. Each batch is
+        pooled with one masked sum over its residues and written straight into the
+        preallocated matrix. Identical sequences are embedded once; with a `cache_dir`,
+        cached sequences are not embedded at all and new vectors are added to the cache
+        after every batch.
+
+        Sequences longer than the model context are truncated (one warning per call), or,
+        with ``long_sequences='window'``, split into windows of ``max_position_embeddings - 2``
+        residues overlapping by `window_overlap`. The windows are batched like any other
+        sequence; overlapping residues get the mean of their states, and the sequence
+        vector is the mean over all its residues. Pooling is linear in the sequence length.
 
         Parameters
         ----------
         seqs : list[str]
             Raw amino-acid strings (no BOS/EOS).
         batch_size : int, default 32
-            Forward-pass chunk size.
+            Maximum number of sequences per forward pass.
+        max_tokens : int | None
+            Maximum padded tokens (sequences × longest length) per forward pass;
+            defaults to the embedder's `max_tokens` (no budget if None).
+        out_path : str | None
+            If given, the matrix is a memory-mapped ``.npy`` file at this path
+            (reopen with ``np.load(out_path, mmap_mode="r")``) instead of RAM.
 
         Returns
         -------
-        list[np.ndarray]
-            One ``(hidden_dim,)`` float32 vector per input sequence,
-            always on CPU for downstream neutrality.
+        np.ndarray
+            ``(len(seqs), hidden_dim)`` float32 array (``np.memmap`` with `out_path`), on CPU.
         """
+        max_tokens = self.max_tokens if max_tokens is None else max_tokens
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"max_tokens must be a positive integer, received {max_tokens}")
+
+        shape = (len(seqs), self.model.config.hidden_size)
+        if out_path is None:
+            out = np.empty(shape, dtype=np.float32)
+        else:
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float32, shape=shape)
         if not seqs:
-            _logger.info("No sequences provided; returning empty list.")
-            return []
+            _logger.info("No sequences provided; returning an empty matrix.")
+            return out
 
-        _logger.info("Embedding %d sequences (batch_size=%d)", len(seqs), batch_size)
-        out: list[np.ndarray] = []
+        _logger.info("Embedding %d sequences (batch_size=%d, max_tokens=%s)", len(seqs), batch_size, max_tokens)
         max_len = self.model.config.max_position_embeddings
 
-        for start in range(0, len(seqs), batch_size):
-            chunk = seqs[start : start + batch_size]
-            _logger.debug("Processing chunk [%d:%d] of size %d", start, start + batch_size, len(chunk))
-
-            for s in chunk:
-                if len(s) > max_len - 2:   # minus BOS/EOS
-                    _logger.warning(
-                        f"Sequence length {len(s)} exceeds {max_len-2}; truncating."
-                    )
+        todo = np.arange(len(seqs))
+        if self.cache is not None:
+            hit, cached = self.cache.get(self.cache_namespace, seqs, shape[1])
+            out[hit] = cached
+            todo = todo[~hit]
+            _logger.info("Embedding cache: %d hit(s), %d miss(es)", hit.sum(), len(todo))
+        first = {} # sequence → first row needing it
+        for i in todo:
+            first.setdefault(seqs[i], i)
+        rows = list(first.values())
+
+        # pieces: (row, start, end) — a whole sequence, or one window of a long one
+        window = max_len - 2  # minus BOS/EOS
+        long_rows = [i for i in rows if len(seqs[i]) > window]
+        weights: Dict[int, np.ndarray] = {} # row → per-residue pooling weight of windowed rows
+        pieces = []
+        for i in rows:
+            if len(seqs[i]) <= window or self.long_sequences == "truncate":
+                pieces.append((i, 0, min(len(seqs[i]), window)))
+                continue
+            starts = self._window_starts(len(seqs[i]), window, self.window_overlap)
+            coverage = np.zeros(len(seqs[i]), dtype=np.float32)
+            for start in starts:
+                coverage[start:start + window] += 1
+                pieces.append((i, start, start + window))
+            # mean over windows per residue, then mean over residues
+            weights[i] = 1 / (coverage * len(seqs[i]))
+        if long_rows and self.long_sequences == "truncate":
+            _logger.warning(f"{len(long_rows)} sequence(s) longer than {window} residues were truncated "
+                            "(long_sequences='window' embeds them whole)")
+        elif long_rows:
+            _logger.info(f"{len(long_rows)} long sequence(s) split into {len(pieces) - len(rows) + len(long_rows)} windows")
+
+        remaining = {i: 0 for i in rows} # pieces still to embed per row
+        for i, _, _ in pieces:
+            remaining[i] += 1
+        out[rows] = 0
+
+        lengths = [end - start for _, start, end in pieces]
+        for positions in self._length_batches(lengths, batch_size, max_tokens):
+            batch = [pieces[p][0] for p in positions]
+            chunk = [seqs[i][start:end] for i, start, end in (pieces[p] for p in positions)]
+            _logger.debug("Processing batch of %d sequences (longest %d residues)", len(chunk), lengths[positions[0]])
 
             toks = self.tokenizer(
                 chunk,
@@ -182,9 +471,7 @@ class AAChainEmbedder:
             # attention_mask       [B, L]  (1 for real tokens (residues + BOS/EOS), 0 for PAD)
             # special_tokens_mask  [B, L]  (1 for BOS/EOS/<mask>, 0 otherwise)
             spec_mask = toks.pop("special_tokens_mask") 
-            hidden_states = self.model(
-                **toks, output_hidden_states=True # returns all layer outputs.
-            ).hidden_states[self.repr_idx]  # [B, L, D]
+            hidden_states = self._repr_states(toks)  # [B, L, D]
 
             # ^^^ B = num sequences; L = num tokens per seq (AAs + BOS/EOS); D = dims per embedding
 
@@ -193,14 +480,61 @@ class AAChainEmbedder:
             spec_mask = spec_mask.bool()
             keep_mask = attn_mask & (~spec_mask) # attn_mask AND NOT(spec_mask)
 
-            # pool
-            for i in range(hidden_states.size(0)):
-                emb = hidden_states[i][keep_mask[i]].mean(0)
-                out.append(emb.to(dtype=torch.float32, device="cpu").numpy())
-        
+            # masked (weighted) mean for the whole batch: [B, 1, L] @ [B, L, D] → [B, D]
+            keep = keep_mask.to(hidden_states.dtype)
+            keep = keep / keep.sum(1, keepdim=True)
+            for row, p in enumerate(positions):
+                i, start, end = pieces[p]
+                if i in weights:
+                    residues = keep_mask[row].nonzero()[:, 0]
+                    keep[row, residues] = torch.as_tensor(weights[i][start:end][:len(residues)],
+                                                          dtype=keep.dtype, device=keep.device)
+            pooled = torch.bmm(keep.unsqueeze(1), hidden_states).squeeze(1)
+            # windows of one sequence add up in its row; back into input order
+            np.add.at(out, batch, pooled.to(dtype=torch.float32, device="cpu").numpy())
+
+            done = []
+            for i in batch:
+                remaining[i] -= 1
+                if not remaining[i]:
+                    done.append(i)
+            if self.cache is not None and done:
+                self.cache.put(self.cache_namespace, [seqs[i] for i in done], out[done])
+
+        duplicates = [i for i in todo if first[seqs[i]] != i]
+        if duplicates:
+            out[duplicates] = out[[first[seqs[i]] for i in duplicates]]
+        if isinstance(out, np.memmap):
+            out.flush()
         _logger.info("Finished embedding; produced %d vectors", len(out))
         return out
 
+    def embed_sequences(
+        self, seqs: List[str], batch_size: int = 32, max_tokens: Optional[int] = None
+    ) -> List[np.ndarray]:
+        """
+        Return a mean-pooled embedding for every sequence.
+
+        Parameters
+        ----------
+        seqs : list[str]
+            Raw amino-acid strings (no BOS/EOS).
+        batch_size : int, default 32
+            Maximum number of sequences per forward pass.
+        max_tokens : int | None
+            Padded-token budget per forward pass, see `embed_matrix`.
+
+        Returns
+        -------
+        list[np.ndarray]
+            One ``(hidden_dim,)`` float32 vector per input sequence,
+            always on CPU for downstream neutrality (rows of one `embed_matrix` array).
+        """
+        if not seqs:
+            _logger.info("No sequences provided; returning empty list.")
+            return []
+        return list(self.embed_matrix(seqs, batch_size, max_tokens))
+
 
 class FreeTXTEmbedder:
     """
@@ -230,6 +564,10 @@ class FreeTXTEmbedder:
         "SMALL_OPENAI_MODEL": "text-embedding-3-small",
         "LARGE_OPENAI_MODEL": "text-embedding-3-large"
     }
+    DIMENSIONS = {
+        "text-embedding-3-small": 1536,
+        "text-embedding-3-large": 3072
+    }
     CACHING_MODES = {"NOT_CACHING", "APPEND", "CREATE/OVERRIDE"}
 
     def __init__(
@@ -398,41 +736,154 @@ class FreeTXTEmbedder:
 #                           Multi-hot Encodings
 # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
+# ---------Arrow list columns (clean_col(..., output="arrow" / "codes"))---------
+def _is_arrow_list(values: pd.Series) -> bool:
+    """True if *values* is an Arrow-backed list column."""
+    dtype = values.dtype
+    return isinstance(dtype, pd.ArrowDtype) and pa.types.is_list(dtype.pyarrow_dtype)
+
+
+def _combined(values: pd.arrays.ArrowExtensionArray) -> pa.Array:
+    arr = pa.array(values)
+    return arr.combine_chunks() if isinstance(arr, pa.ChunkedArray) else arr
+
+
+def _list_array(values: pd.Series) -> pa.ListArray:
+    """Underlying contiguous `pa.ListArray` of an Arrow list column (nulls → empty lists)."""
+    arr = _combined(values.array)
+    return pc.fill_null(arr, pa.scalar([], type=arr.type)) if arr.null_count else arr
+
+
+def _factorized_terms(arr: pa.ListArray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `pd.factorize` of the flat items of a list column: (codes, distinct items).
+
+    Dictionary-coded lists (`output="codes"`) are factorized on their int32 codes,
+    so only the vocabulary entries the rows reference are ever turned into strings.
+    """
+    flat = pc.list_flatten(arr)
+    if pa.types.is_dictionary(flat.type):
+        codes, used = pd.factorize(flat.indices.to_numpy(zero_copy_only=False))
+        return codes, flat.dictionary.take(pa.array(used, type=pa.int64())).to_numpy(zero_copy_only=False)
+    return pd.factorize(flat.to_numpy(zero_copy_only=False))
+
+
+def _list_array_from_pairs(rows: np.ndarray, values: np.ndarray, n_rows: int, value_type: pa.DataType) -> pa.ListArray:
+    """Build a list array with `n_rows` rows from (row, value) pairs sorted by row."""
+    offsets = np.zeros(n_rows + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=offsets[1:])
+    return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), pa.array(values, type=value_type))
+
+
+def _empty_lists_to_null(arr: pa.ListArray) -> pa.Array:
+    return pc.if_else(pc.equal(pc.list_value_length(arr), 0), pa.scalar(None, type=arr.type), arr)
+
+
+def _flat_map_terms(arr: pa.ListArray, term_fn) -> pa.ListArray:
+    """
+    Replace every term by the terms of `term_fn(term)` (called once per distinct term),
+    then sort and de-duplicate each row — the row-wise union the GO/EC collapses compute.
+    """
+    rows = pc.list_parent_indices(arr).to_numpy()
+    codes, uniques = _factorized_terms(arr)
+    mapped = pa.array([list(term_fn(term)) for term in uniques], type=pa.list_(pa.string()))
+    per_term = mapped.take(pa.array(codes, type=pa.int64()))
+    pairs = pd.DataFrame({
+        "row": rows[pc.list_parent_indices(per_term).to_numpy()],
+        "term": pc.list_flatten(per_term).to_numpy(zero_copy_only=False),
+    }).drop_duplicates().sort_values(["row", "term"], kind="stable")
+    return _list_array_from_pairs(pairs["row"].to_numpy(), pairs["term"].to_numpy(), len(arr), pa.string())
+
+
 class MultiHotEncoder:
     """Generic helper: tuple-of-labels ➜ tuple-of-int-indices (memory-light)."""
 
     def __init__(self):
         self.mlb = MultiLabelBinarizer()
 
-    def encode(self, sequences: pd.Series):
+    def encode(self, sequences: pd.Series, class_labels: Optional[Dict[str, int]] = None):
         """
         Fit a `sklearn.preprocessing.MultiLabelBinarizer`
         and encode each sample as a tuple of integer indices.
 
+        If `class_labels` (label → index) is given, it is used as is instead of
+        fitting, so separately encoded chunks share one index space; labels
+        missing from it are dropped.
+
+        Arrow `list<string>` (or dictionary-coded) input is encoded without leaving
+        Arrow/NumPy, looking each distinct label up once, and returns the encodings
+        as an Arrow `list<int32>` array.
+
         Raises
         ------
         ValueError
             If any element in sequences is not a ``tuple``.
         """
         _logger.info("MultiHot-encoding %d entries", len(sequences))
+        if _is_arrow_list(sequences):
+            return self._encode_arrow(_list_array(sequences), class_labels)
         # ----checking-everything-is-tuple-----------------------------------
         if not sequences.map(lambda x: isinstance(x, tuple)).all():
             bad = sequences[~sequences.map(lambda x: isinstance(x, tuple))].index[:5]
             _logger.error("Non-tuple entries detected at rows %s", list(bad))
             raise ValueError(f"Non-tuple entries detected at rows {list(bad)}")
         # -------------------------------------------------------------------
-        self.mlb.fit(sequences)
-        cls_to_idx = {c: i for i, c in enumerate(self.mlb.classes_)}
-        _logger.debug("Class-to-index map built with %d classes", len(cls_to_idx))
+        if class_labels is None:
+            self.mlb.fit(sequences)
+            cls_to_idx = {c: i for i, c in enumerate(self.mlb.classes_)}
+            _logger.debug("Class-to-index map built with %d classes", len(cls_to_idx))
+        else:
+            cls_to_idx = dict(class_labels)
+            unknown = {lbl for seq in sequences for lbl in seq} - cls_to_idx.keys()
+            if unknown:
+                _logger.warning("Dropping %d label(s) missing from the given class labels", len(unknown))
 
         encoded = [
-            tuple(sorted(cls_to_idx[lbl] for lbl in seq)) for seq in sequences
+            tuple(sorted(cls_to_idx[lbl] for lbl in seq if lbl in cls_to_idx)) for seq in sequences
         ]
         return {
             "encodings": encoded,
             "class_labels": cls_to_idx,
         }
 
+    def _encode_arrow(self, arr: pa.ListArray, class_labels: Optional[Dict[str, int]] = None):
+        rows = pc.list_parent_indices(arr).to_numpy()
+        label_codes, labels = _factorized_terms(arr)
+        if class_labels is None:
+            classes = sorted(labels)
+            self.mlb.fit([classes])
+            cls_to_idx = {c: i for i, c in enumerate(classes)}
+            _logger.debug("Class-to-index map built with %d classes", len(cls_to_idx))
+        else:
+            cls_to_idx = dict(class_labels)
+
+        positions = pd.Index(list(cls_to_idx)).get_indexer(labels)[label_codes]
+        known = positions >= 0
+        if not known.all():
+            _logger.warning("Dropping %d label(s) missing from the given class labels",
+                            len(np.unique(label_codes[~known])))
+        codes = np.fromiter(cls_to_idx.values(), dtype=np.int32, count=len(cls_to_idx))[positions[known]]
+        rows = rows[known]
+        order = np.lexsort((codes, rows)) # by row, then index
+        encoded = _list_array_from_pairs(rows[order], codes[order], len(arr), pa.int32())
+        return {
+            "encodings": pd.arrays.ArrowExtensionArray(encoded),
+            "class_labels": cls_to_idx,
+        }
+
+    @staticmethod
+    def _assign(df: pd.DataFrame, col_name: str, enc_info: dict) -> None:
+        """Write encodings back to df[col_name]; empty rows become NaN (null for Arrow)."""
+        encodings = enc_info["encodings"]
+        if isinstance(encodings, pd.arrays.ArrowExtensionArray):
+            df[col_name] = pd.Series(
+                pd.arrays.ArrowExtensionArray(_empty_lists_to_null(_combined(encodings))),
+                index=df.index
+            )
+            return
+        df.loc[:, col_name] = pd.Series(list(encodings), index=df.index, dtype=object)
+        df.loc[:, col_name] = df[col_name].map(lambda x: np.nan if x == () else x)
+
 
 class GOEncoder(MultiHotEncoder):
     """
@@ -451,13 +902,20 @@ class GOEncoder(MultiHotEncoder):
     
     # ---------PROTECTED---------
     def _auto_depth(self, series: pd.Series, coverage_target: float = 0.8) -> int:
-        depths = [
-            self.godag[gid].depth
-            for terms in series.dropna()
-            for gid in terms
-            if gid in self.godag
-        ]
-        if not depths:
+        if _is_arrow_list(series):
+            # one DAG lookup per distinct term, weighted by its occurrences
+            codes, uniques = _factorized_terms(_list_array(series))
+            term_depths = np.array([self.godag[gid].depth if gid in self.godag else -1 for gid in uniques])
+            depths = term_depths[codes] if len(codes) else term_depths
+            depths = depths[depths >= 0]
+        else:
+            depths = [
+                self.godag[gid].depth
+                for terms in series.dropna()
+                for gid in terms
+                if gid in self.godag
+            ]
+        if not len(depths):
             raise ValueError("No valid GO IDs found to compute automatic depth.")
         depth = int(np.percentile(depths, coverage_target * 100))
         _logger.info("Auto-selected GO depth=%d (coverage_target=%.2f)", depth, coverage_target)
@@ -475,9 +933,38 @@ class GOEncoder(MultiHotEncoder):
         return tuple(sorted(kept))
 
     # ---------PUBLIC---------
+    def fit_term_counts(
+        self, term_counts: Mapping[str, int], depth: Optional[int] = None,
+        coverage_target: float = 0.8) -> Tuple[int, Dict[str, int]]:
+        """
+        Fit from per-term occurrence counts instead of a column.
+
+        Returns the depth and term→index map `encode_go` would fit on a column
+        whose GO terms occur `term_counts` times in total, so a file can be fitted
+        chunk by chunk while only its distinct terms are kept.
+        """
+        if depth is None:
+            known = sorted((self.godag[gid].depth, n) for gid, n in term_counts.items()
+                           if gid in self.godag and n > 0)
+            if not known:
+                raise ValueError("No valid GO IDs found to compute automatic depth.")
+            depths = np.array([d for d, _ in known])
+            ends = np.cumsum([n for _, n in known])
+            # linear interpolation as np.percentile does over the repeated depths
+            pos = coverage_target * (ends[-1] - 1)
+            lo = int(pos)
+            d_lo, d_hi = depths[np.searchsorted(ends, [lo, min(lo + 1, ends[-1] - 1)], side="right")]
+            depth = int(d_lo + (pos - lo) * (d_hi - d_lo))
+            _logger.info("Auto-selected GO depth=%d (coverage_target=%.2f)", depth, coverage_target)
+        classes = set()
+        for gid in term_counts:
+            classes.update(self._collapse_to_depth((gid,), depth))
+        return depth, {c: i for i, c in enumerate(sorted(classes))}
+
     def encode_go(
         self, df: pd.DataFrame, col_name: str, depth: Union[None, int] = None,
-        coverage_target: Union[float, None] = None, inplace: bool = False):
+        coverage_target: Union[float, None] = None, inplace: bool = False,
+        class_labels: Optional[Dict[str, int]] = None):
         """
         Collapse GO term lists to a single depth and encode as indices.
 
@@ -493,6 +980,8 @@ class GOEncoder(MultiHotEncoder):
             Percentile (0-1) of depth distribution to keep if depth not given.
         inplace : bool, default False
             Whether to mutate df or return a copy.
+        class_labels : dict[str, int] | None
+            Fixed term→index map (e.g. fitted on the whole file); see `MultiHotEncoder.encode`.
 
         Returns
         -------
@@ -509,11 +998,14 @@ class GOEncoder(MultiHotEncoder):
                 )
             depth = self._auto_depth(df[col_name], coverage_target)
 
-        collapsed = df.loc[:, col_name].map(lambda terms: self._collapse_to_depth(terms, depth))
-        enc_info = self.encode(collapsed)
-
-        df.loc[:, col_name] = pd.Series(list(enc_info["encodings"]), index=df.index, dtype=object)
-        df.loc[:, col_name] = df[col_name].map(lambda x: np.nan if x == () else x)
+        if _is_arrow_list(df[col_name]):
+            collapsed = pd.Series(pd.arrays.ArrowExtensionArray(_flat_map_terms(
+                _list_array(df[col_name]), lambda gid: self._collapse_to_depth((gid,), depth)
+            )), index=df.index)
+        else:
+            collapsed = df.loc[:, col_name].map(lambda terms: self._collapse_to_depth(terms, depth))
+        enc_info = self.encode(collapsed, class_labels)
+        self._assign(df, col_name, enc_info)
 
         return df, enc_info["class_labels"]
 
@@ -535,11 +1027,14 @@ class ECEncoder(MultiHotEncoder):
     def _all_codes_at_depth(self, series: pd.Series, depth: int) -> set[str]:
         """Unique EC strings you'd get after collapsing every entry to `depth`."""
         codes: set[str] = set()
-        for terms in series.dropna():
-            for ec in terms:
-                parts = self._extract_ec_codes(ec)[:depth]
-                if parts:
-                    codes.add(".".join(parts))
+        if _is_arrow_list(series):
+            terms = _factorized_terms(_list_array(series))[1]
+        else:
+            terms = (ec for entry in series.dropna() for ec in entry)
+        for ec in terms:
+            parts = self._extract_ec_codes(ec)[:depth]
+            if parts:
+                codes.add(".".join(parts))
         return codes
 
     def _auto_depth(
@@ -551,7 +1046,10 @@ class ECEncoder(MultiHotEncoder):
         Pick depth ∈ {4,3,2,1} whose unique-class count is
         closest to N / examples_per_class.
         """
-        N = series.dropna().map(len).sum() # total annotations
+        if _is_arrow_list(series):
+            N = len(pc.list_flatten(_list_array(series))) # total annotations
+        else:
+            N = series.dropna().map(len).sum() # total annotations
         target_k = max(1, N // examples_per_class) # rough class budget
 
         best_depth, best_diff = None, float("inf")
@@ -582,6 +1080,26 @@ class ECEncoder(MultiHotEncoder):
         return tuple(sorted(set(collapsed)))
 
     # ------------- PUBLIC -------------
+    def fit_term_counts(
+        self,
+        term_counts: Mapping[str, int],
+        depth: Optional[int] = None,
+        examples_per_class: int = 30
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Depth and EC-code→index map `encode_ec` would fit on a column whose
+        EC numbers occur `term_counts` times in total (see `GOEncoder.fit_term_counts`).
+        """
+        if depth is None:
+            N = sum(term_counts.values()) # total annotations
+            target_k = max(1, N // examples_per_class)
+            diffs = {d: abs(len(self._all_codes_at_depth(pd.Series([tuple(term_counts)]), d)) - target_k)
+                     for d in (4, 3, 2, 1)}
+            depth = min(diffs, key=diffs.get) # first of the ties, in 4→1 order
+            _logger.info("Auto-selected depth=%d  (target=%d)", depth, target_k)
+        classes = self._collapse_to_depth(tuple(term_counts), depth)
+        return depth, {c: i for i, c in enumerate(classes)}
+
     def encode_ec(
         self,
         df: pd.DataFrame,
@@ -589,10 +1107,12 @@ class ECEncoder(MultiHotEncoder):
         *,
         depth: Optional[int] = None,
         examples_per_class: int = 30,
-        inplace: bool = False
+        inplace: bool = False,
+        class_labels: Optional[Dict[str, int]] = None
     ) -> Tuple[pd.DataFrame, Dict[str, int]]:
         """
         Collapse EC numbers to `depth` (or auto-depth) and multi-hot encode.
+        A fixed `class_labels` map skips fitting (see `MultiHotEncoder.encode`).
 
         Returns
         -------
@@ -606,11 +1126,19 @@ class ECEncoder(MultiHotEncoder):
         if depth is None:
             depth = self._auto_depth(series, examples_per_class)
 
+        if _is_arrow_list(series):
+            collapsed = pd.Series(pd.arrays.ArrowExtensionArray(_flat_map_terms(
+                _list_array(series), lambda ec: self._collapse_to_depth((ec,), depth)
+            )), index=df.index)
+            enc_info = self.encode(collapsed, class_labels)
+            self._assign(df, col_name, enc_info)
+            return df, enc_info["class_labels"]
+
         collapsed = series.map(
             lambda terms: self._collapse_to_depth(terms, depth)
         )
 
-        enc_info = self.encode(collapsed)
+        enc_info = self.encode(collapsed, class_labels)
         df[col_name] = pd.Series(
             list(enc_info["encodings"]), index=df.index, dtype=object
         ).map(lambda x: np.nan if x == () else x)
@@ -618,12 +1146,15 @@ class ECEncoder(MultiHotEncoder):
         return df, enc_info["class_labels"]
 
 
-def encode_multihot(df: pd.DataFrame, col: str, inplace: bool = False) -> Tuple[pd.DataFrame, Dict[str, int]]:
+def encode_multihot(
+    df: pd.DataFrame, col: str, inplace: bool = False,
+    class_labels: Optional[Dict[str, int]] = None
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
     """
     One-shot convenience wrapper around `MultiHotEncoder`.
 
-    Fits on df[col] and overwrites (or copies) that column
-    with index tuples.
+    Fits on df[col] (or uses the given `class_labels`) and overwrites
+    (or copies) that column with index tuples.
 
     Returns
     -------
@@ -634,9 +1165,8 @@ def encode_multihot(df: pd.DataFrame, col: str, inplace: bool = False) -> Tuple[
     df = df if inplace else df.copy(deep=True)
 
     encoder = MultiHotEncoder()
-    enc_info = encoder.encode(df[col])
-    df.loc[:, col] = pd.Series(list(enc_info["encodings"]), index=df.index, dtype=object)
-    df.loc[:, col] = df[col].map(lambda x: np.nan if x == () else x)
+    enc_info = encoder.encode(df[col], class_labels)
+    encoder._assign(df, col, enc_info)
 
     return df, enc_info["class_labels"]
 
@@ -646,6 +1176,7 @@ __all__ = [
     "GOEncoder",
     "FreeTXTEmbedder",
     "AAChainEmbedder",
+    "SequenceEmbeddingCache",
     "ECEncoder"
 ]
 
@@ -7,6 +7,8 @@ import logging
 # third-party:
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import zarr
 
 # local:
@@ -14,7 +16,10 @@ from .embedding_utils import (FreeTXTEmbedder,
                               AAChainEmbedder,
                               GOEncoder,
                               ECEncoder,
-                              encode_multihot)
+                              encode_multihot,
+                              _is_arrow_list,
+                              _list_array,
+                              _factorized_terms)
 from . import util
 
 # *-----------------------------------------------*
@@ -57,6 +62,35 @@ def max_pool(embeddings: List[np.ndarray]) -> np.ndarray:
     max_idx = np.argmax(norms)
     return embeddings[max_idx]
 
+def _replace_col(df: pd.DataFrame, col: str, values: pd.Series) -> None:
+    """Overwrite df[col]; Arrow list columns are replaced whole since their dtype changes."""
+    if _is_arrow_list(df[col]):
+        df[col] = values
+    else:
+        df.loc[:, col] = values
+
+def _max_pool_rows(values: pd.Series, embedding_map: dict) -> pd.Series:
+    """
+    `max_pool` the embeddings of every row's items (NaN for empty rows).
+
+    Arrow list columns are pooled over their flat items: one norm per distinct item,
+    then the first max-norm item of each row wins, as in `max_pool`.
+    """
+    if not _is_arrow_list(values):
+        return values.map(lambda entry: max_pool([embedding_map[s] for s in entry]) if entry else np.nan)
+
+    arr = _list_array(values)
+    rows = pc.list_parent_indices(arr).to_numpy()
+    out = np.full(len(arr), np.nan, dtype=object)
+    if len(rows):
+        codes, uniques = _factorized_terms(arr)
+        embeddings = [embedding_map[item] for item in uniques]
+        norms = np.array([np.linalg.norm(emb) for emb in embeddings])[codes]
+        order = np.lexsort((-norms, rows)) # stable: ties keep item order
+        first = order[np.r_[True, rows[order][1:] != rows[order][:-1]]]
+        out[rows[first]] = [embeddings[codes[i]] for i in first]
+    return pd.Series(out, index=values.index, dtype=object)
+
 def vals2embs_map(df: pd.DataFrame, col: str, embedder: Union[AAChainEmbedder, FreeTXTEmbedder], batch_size: int):
     """
     Create a mapping from each individual value in a DataFrame column to its embedding.
@@ -71,12 +105,16 @@ def vals2embs_map(df: pd.DataFrame, col: str, embedder: Union[AAChainEmbedder, F
         A dictionary mapping each unique item to its embedding (numpy array).
         Returns an empty dict if there are no items to embed.
     """
-    unique_vals = df[col].dropna().unique()
-    vals = list(dict.fromkeys([item
-            for val in unique_vals
-            for item in val
-            if item
-        ])) # flatten
+    if _is_arrow_list(df[col]):
+        # distinct items of the whole list column at once; same first-appearance order as below
+        vals = [item for item in _factorized_terms(_list_array(df[col]))[1] if item]
+    else:
+        unique_vals = df[col].dropna().unique()
+        vals = list(dict.fromkeys([item
+                for val in unique_vals
+                for item in val
+                if item
+            ])) # flatten
     if not vals:
         return {} 
     val2emb_map = dict(zip(vals, embedder.embed_sequences(vals, batch_size)))
@@ -92,6 +130,10 @@ def save_df(df: pd.DataFrame, pth: str, metadata: Optional[dict] = None) -> None
     Supports:
       - ASCII string IDs        → fixed-length byte arrays
       - Ragged int tuples       → flat int32 values + int32 offsets
+      - Arrow `list<int>` columns (encoded labels) → the same layout
+      - Arrow `list<string>` / `list<dictionary<int32, string>>` columns (cleaned
+        tokens)                 → flat UTF-8 byte strings + offsets, loaded back as
+                                  tuples of str (dictionaries are decoded first)
       - Dense float arrays      → 2D float32 datasets
 
     Args:
@@ -121,6 +163,27 @@ def save_df(df: pd.DataFrame, pth: str, metadata: Optional[dict] = None) -> None
         offsets[0] = 0
         np.cumsum(lengths, out=offsets[1:])
         return np.array(flat_vals, dtype=np.uint16), np.array(offsets, dtype=np.uint16)
+
+    def flatten_offset_arrow(lists: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        # an Arrow list column already is (flat values, offsets)
+        arr = _list_array(lists)
+        offsets = arr.offsets.to_numpy()
+        flat_vals = pc.list_flatten(arr).to_numpy()
+        return np.array(flat_vals, dtype=np.uint16), np.array(offsets - offsets[0], dtype=np.uint16)
+
+    def flatten_offset_arrow_strings(lists: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        arr = _list_array(lists)
+        flat = pc.list_flatten(arr)
+        if pa.types.is_dictionary(flat.type):
+            flat = flat.cast(flat.type.value_type) # codes → token strings
+        if not pa.types.is_string(flat.type) and not pa.types.is_large_string(flat.type):
+            raise ValueError(f"The dataframe contains unsupported Arrow list values: {flat.type}. "
+                             "Expected: integers or strings")
+        # tokens may be non-ASCII, so store their UTF-8 bytes
+        encoded = [token.encode("utf-8") for token in flat.to_pylist()]
+        flat_vals = np.asarray(encoded, dtype=f"S{max(1, max(map(len, encoded), default=1))}")
+        offsets = arr.offsets.to_numpy()
+        return flat_vals, np.array(offsets - offsets[0], dtype=np.int64)
     # --------------------------------
 
     _logger.info(f"Saving DataFrame with {df.shape[0]} rows and {df.shape[1]} columns to {pth}")
@@ -154,7 +217,23 @@ def save_df(df: pd.DataFrame, pth: str, metadata: Optional[dict] = None) -> None
             col_storage.create_array('accessions', data=data_bytes,
                                     compressors=zarr.codecs.BloscCodec(cname="zlib", clevel=3, shuffle=zarr.codecs.BloscShuffle.noshuffle))
 
-            if isinstance(notna_vals.iloc[0], tuple):
+            if _is_arrow_list(notna_vals) and pa.types.is_integer(notna_vals.dtype.pyarrow_dtype.value_type):
+                _logger.debug(f"{col_name} is an Arrow list column: saving its values + offsets")
+                flat_vals, offsets = flatten_offset_arrow(notna_vals)
+                col_storage.create_array('flat_vals', data=flat_vals,
+                                        compressors=zarr.codecs.BloscCodec(cname="lz4", clevel=2, shuffle=zarr.codecs.BloscShuffle.bitshuffle))
+                col_storage.create_array('offsets', data=offsets,
+                                        compressors=zarr.codecs.BloscCodec(cname="lz4", clevel=2, shuffle=zarr.codecs.BloscShuffle.bitshuffle))
+
+            elif _is_arrow_list(notna_vals):
+                _logger.debug(f"{col_name} is an Arrow list column of tokens: saving its strings + offsets")
+                flat_strings, offsets = flatten_offset_arrow_strings(notna_vals)
+                col_storage.create_array('flat_strings', data=flat_strings,
+                                        compressors=zarr.codecs.BloscCodec(cname="zstd", clevel=3, shuffle=zarr.codecs.BloscShuffle.noshuffle))
+                col_storage.create_array('offsets', data=offsets,
+                                        compressors=zarr.codecs.BloscCodec(cname="lz4", clevel=2, shuffle=zarr.codecs.BloscShuffle.bitshuffle))
+
+            elif isinstance(notna_vals.iloc[0], tuple):
                 _logger.debug(f"{col_name} contains tuples: saving as flattened list + offsets")
                 flat_vals, offsets = flatten_offset(notna_vals)
                 col_storage.create_array('flat_vals', data=flat_vals,
@@ -225,6 +304,14 @@ def load_df(path: str) -> pd.DataFrame:
                 for i in range(len(col_acc))
             ]
 
+        elif {"flat_strings", "offsets"} <= set(grp.array_keys()):
+            flat = np.char.decode(grp["flat_strings"][:], encoding="utf-8").tolist()
+            offs = grp["offsets"][:].astype(int)
+            values = [
+                tuple(flat[offs[i]:offs[i + 1]])
+                for i in range(len(col_acc))
+            ]
+
         elif "data" in grp.array_keys():
             data   = grp["data"][:].astype(np.float32)
             values = [row for row in data]
@@ -282,8 +369,7 @@ def embed_freetxt_cols(df: pd.DataFrame, cols: List[str], embedder: FreeTXTEmbed
         df = df.copy(deep=True)
     for col in cols:
         embedding_map = vals2embs_map(df, col, embedder, batch_size)
-        df.loc[:, col] = df.loc[:, col].map(lambda entry: max_pool([embedding_map[s] for s in entry])
-                                            if entry else np.nan)
+        _replace_col(df, col, _max_pool_rows(df[col], embedding_map))
     return df
 
 # *-----------------------------------------------*
@@ -349,9 +435,7 @@ def embed_ft_domains(df: pd.DataFrame, embedder: AAChainEmbedder,
 
     embedding_map = vals2embs_map(df, "tmp_domain_seqs", embedder, batch_size)
 
-    df.loc[:, "Domain [FT]"] = df["tmp_domain_seqs"].map(
-        lambda entry: max_pool([embedding_map[s] for s in entry]) if entry else np.nan
-    )
+    _replace_col(df, "Domain [FT]", _max_pool_rows(df["tmp_domain_seqs"], embedding_map))
     df.drop(columns="tmp_domain_seqs", inplace=True)
     
     return df
@@ -374,7 +458,12 @@ def embed_AAsequences(df: pd.DataFrame, embedder: AAChainEmbedder,
         df = df.copy(deep=True)
 
     embedding_map = vals2embs_map(df, "Sequence", embedder, batch_size)
-    df.loc[:, "Sequence"] = df["Sequence"].map(lambda s: embedding_map[s[0]] if s else np.nan)
+    if _is_arrow_list(df["Sequence"]):
+        first = pc.list_slice(_list_array(df["Sequence"]), 0, 1) # the raw sequence only
+        df["Sequence"] = _max_pool_rows(pd.Series(pd.arrays.ArrowExtensionArray(first), index=df.index),
+                                        embedding_map)
+    else:
+        df.loc[:, "Sequence"] = df["Sequence"].map(lambda s: embedding_map[s[0]] if s else np.nan)
 
     return df
 
@@ -384,6 +473,7 @@ def embed_AAsequences(df: pd.DataFrame, embedder: AAChainEmbedder,
 
 _go_enc = GOEncoder(os.path.join(SCRIPT_DIR, "dependencies", "go-basic.obo"))
 encode_go = _go_enc.encode_go
+fit_go_term_counts = _go_enc.fit_term_counts
 
 # *-----------------------------------------------*
 #                       ec
@@ -391,6 +481,7 @@ encode_go = _go_enc.encode_go
 
 _ec_enc = ECEncoder()
 encode_ec = _ec_enc.encode_ec
+fit_ec_term_counts = _ec_enc.fit_term_counts
 
 
 __all__ = [
@@ -401,6 +492,8 @@ __all__ = [
     "encode_go",
     "encode_ec",
     "encode_multihot",
+    "fit_go_term_counts",
+    "fit_ec_term_counts",
     "save_df",
     "load_df"
 ]
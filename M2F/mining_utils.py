@@ -1,15 +1,31 @@
 # builtins:
 import os
+import glob
 import time
 import io
-from typing import List, Optional, Iterable, Tuple
+import json
+import hashlib
+from typing import List, Optional, Iterable, Tuple, Dict, Any, NamedTuple, Callable, Union
 import re
 import logging
+import sqlite3
+import threading
+import functools
 from math import ceil
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
 
 # third-party:
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 # local:
 from . import util
@@ -21,6 +37,47 @@ from . import util
 _logger = logging.getLogger(__name__)
 _UNIREF90_RE   = re.compile(r"UniRef90_([A-Z0-9]+)")
 _UNICLUST90_RE = re.compile(r"UniClust90_([0-9]+)")
+_HUMANN_CHUNK_ROWS = 1_000_000 # gene-family rows parsed at a time
+
+# ---------retrieval-engines---------
+RETRIEVAL_ENGINES = {"search", "idmapping"}
+_IDMAPPING_MAX_IDS       = 100_000 # UniProt's per-job limit
+_IDMAPPING_POLL_INTERVAL = 1.0     # seconds between job status checks
+_SEARCH_FALLBACK_SIZE    = 100     # IDs per search query when a mapping job fails
+
+# ---------retry-policy---------
+_TRANSIENT_STATUS_CODES = {408, 429} # plus every 5xx
+_MAX_TRANSIENT_RETRIES  = 5
+_MAX_BACKOFF            = 60.0     # seconds
+
+# ---------adaptive-rate-control---------
+_ADAPTIVE_MAX_RPS        = 200.0 # hard ceiling for the additive increase
+_ADAPTIVE_MIN_RPS        = 0.1
+_ADAPTIVE_DECREASE       = 0.5   # multiplicative decrease on throttling
+_ADAPTIVE_COOLDOWN       = 1.0   # seconds during which further throttling is the same event
+_ADAPTIVE_SLOW_LATENCY   = 2.0   # recent/long-run latency ratio above which we stop growing
+_ADAPTIVE_LATENCY_SMOOTH = (0.3, 0.02) # EWMA weights of the recent and long-run latency
+
+# ---------streaming---------
+_STREAM_BLOCK_SIZE     = 1 << 20  # bytes of TSV decoded per Arrow record batch
+_STREAM_ROW_GROUP_ROWS = 10_000   # rows buffered before a Parquet row group is written
+# fixed Arrow types of numeric TSV columns (by label), matching what pandas infers; others are strings
+_STREAM_COLUMN_TYPES   = {"Length": pa.int64(), "Mass": pa.int64()}
+
+# ---------local-record-store---------
+_STORE_QUERY_CHUNK = 500 # accessions per SQLite lookup (keeps us under the variable limit)
+
+# ---------checkpointing---------
+MANIFEST_FILE_NAME   = "manifest.json"
+QUARANTINE_FILE_NAME = "quarantine.txt"
+
+# ---------partitioned-dataset-output---------
+OUTPUT_MODES             = {"files", "dataset"}
+DATASET_DIR_NAME         = "dataset"
+DATASET_PARTITION_COLUMN = "accession_prefix"
+_DATASET_ROW_GROUP_ROWS  = 50_000
+_DATASET_COMPRESSION     = "zstd"
+_DATASET_DICTIONARY_MAX_RATIO = 0.5 # dictionary-encode columns with ≤ this share of distinct values
 
 # *-----------------------------------------------*
 #                      UTILS
@@ -28,143 +85,1226 @@ _UNICLUST90_RE = re.compile(r"UniClust90_([0-9]+)")
 
 def extract_accessions_from_humann(
     file_path: str, 
-    out_type: type = list
+    out_type: type = list,
+    chunksize: int = _HUMANN_CHUNK_ROWS
 ) -> Tuple[Iterable, Iterable]:
     """Extract UniRef90 and UniClust90 accessions from a HUMAnN gene-families file.
 
     Parses the `READS_UNMAPPED` column, filters out accessions starting with
     'UNK' or 'UPI' (as UniProtkb queries fail on them),
     and returns two collections of 'out_type': (unirefs, uniclusts).
+    Only that column is read, `chunksize` rows at a time, and IDs are
+    extracted with vectorized string operations, so memory stays bounded.
     """
     unirefs, uniclusts = set(), set()
-    df = pd.read_csv(file_path, sep="\t", skiprows=[0])
-    
-    if "READS_UNMAPPED" not in df.columns:
+    try:
+        reader = pd.read_csv(file_path, sep="\t", skiprows=[0], usecols=["READS_UNMAPPED"],
+                             dtype=str, chunksize=chunksize)
+    except ValueError as e:
         raise KeyError(
             f"Column 'READS_UNMAPPED' not found in {os.path.basename(file_path)}; "
             "check HUMAnN output format or parsing options."
-        )
+        ) from e
 
     _logger.info(f"Extracting UniRef90 and UniClust90 id(s) from {os.path.basename(file_path)}")
-    for id_ in df["READS_UNMAPPED"]:
-        uniref_match = _UNIREF90_RE.search(id_)
+    with reader:
+        for chunk in reader:
+            ids = chunk["READS_UNMAPPED"]
+            uniref = ids.str.extract(_UNIREF90_RE, expand=False)
+            has_uniref = uniref.notna()
 
-        if uniref_match:
-            uniref = uniref_match.group(1)
-            if not uniref.startswith(("UNK", "UPI")):
-                unirefs.add(uniref)
-            continue
-
-        uniclust_match = _UNICLUST90_RE.search(id_)
-        if uniclust_match:
-            uniclusts.add(uniclust_match.group(1))
+            uniref = uniref[has_uniref]
+            unirefs.update(uniref[~uniref.str.startswith(("UNK", "UPI"))].unique())
+            # UniClust90 IDs only count on rows without a UniRef90 ID
+            uniclusts.update(ids[~has_uniref].str.extract(_UNICLUST90_RE, expand=False).dropna().unique())
 
     _logger.info(f"Successfully extracted {len(unirefs)} UniRef90(s) and {len(uniclusts)} UniClust90(s)")
     return out_type(unirefs), out_type(uniclusts)
 
 
+def _extract_accessions_from_files(files: List[str], chunksize: int) -> Tuple[set, set]:
+    """Union the accessions of several HUMAnN files (one process-pool task)."""
+    all_unirefs, all_uniclusts = set(), set()
+    for file in files:
+        unirefs, uniclusts = extract_accessions_from_humann(file, out_type=set, chunksize=chunksize)
+        all_unirefs.update(unirefs)
+        all_uniclusts.update(uniclusts)
+    return all_unirefs, all_uniclusts
+
+
 def extract_all_accessions_from_dir(
     dir_path: str, 
     pattern: Optional[re.Pattern] = None,
-    out_type: type = list
+    out_type: type = list,
+    n_jobs: int = 1,
+    chunksize: int = _HUMANN_CHUNK_ROWS
 ) -> Tuple[Iterable, Iterable]:
     """Aggregate UniRef90 and UniClust90 accessions from all files in a directory.
 
     Iterates files from dir_path, extracts accessions
     per file if file name matches the 'pattern', unions them, and returns (unirefs, uniclusts) of 'out_type'.
+    With `n_jobs > 1`, files are spread over a process pool; each task unions the
+    accessions of a group of files before sending them back, and the partial sets
+    are merged as they arrive.
     """
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be ≥ 1")
+    files = list(util.files_from(dir_path, pattern))
+
+    if n_jobs == 1 or len(files) <= 1:
+        all_unirefs, all_uniclusts = _extract_accessions_from_files(files, chunksize)
+        return out_type(all_unirefs), out_type(all_uniclusts)
+
     all_unirefs, all_uniclusts = set(), set()
-    for file in util.files_from(dir_path, pattern):
-        unirefs, uniclusts = extract_accessions_from_humann(file, out_type=set)
-        all_unirefs.update(unirefs)
-        all_uniclusts.update(uniclusts)
+    # several files per task keeps the sets shipped between processes small
+    group_size = max(1, ceil(len(files) / (n_jobs * 4)))
+    groups = [files[i:i + group_size] for i in range(0, len(files), group_size)]
+    _logger.info(f"Extracting accessions from {len(files)} file(s) with {n_jobs} process(es)")
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        for unirefs, uniclusts in pool.map(_extract_accessions_from_files, groups,
+                                           [chunksize] * len(groups)):
+            all_unirefs.update(unirefs)
+            all_uniclusts.update(uniclusts)
     return out_type(all_unirefs), out_type(all_uniclusts)
 
 
+class AccessionIndex:
+    """
+    Persistent index of HUMAnN files already ingested and the accessions they added.
+
+    Files are recognised by path plus a fingerprint: size and modification time
+    (``fingerprint="mtime"``) or a SHA-1 of their content (``fingerprint="sha1"``).
+    `ingest_dir` only parses new or changed files and returns the accessions
+    that were never seen before, ready to be handed to `fetch_save_uniprotkb_batches`.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the SQLite file (created if missing).
+    fingerprint : {'mtime', 'sha1'}
+        How to detect that a known file changed.
+    """
+
+    FINGERPRINTS = {"mtime", "sha1"}
+
+    def __init__(self, db_path: str, fingerprint: str = "mtime"):
+        _logger.info("Initialising AccessionIndex(db_path=%s, fingerprint=%s)", db_path, fingerprint)
+        if fingerprint not in self.FINGERPRINTS:
+            raise ValueError(f"fingerprint must be one of {self.FINGERPRINTS}")
+        self.db_path = db_path
+        self.fingerprint = fingerprint
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path        TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                ingested_at REAL NOT NULL,
+                n_unirefs   INTEGER NOT NULL,
+                n_uniclusts INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS accessions (
+                kind       TEXT NOT NULL,
+                accession  TEXT NOT NULL,
+                first_file TEXT NOT NULL,
+                PRIMARY KEY (kind, accession)
+            );
+        """)
+        self._conn.commit()
+
+    # ---------PRIVATE-----------
+    def _fingerprint(self, path: str) -> str:
+        st = os.stat(path)
+        if self.fingerprint == "mtime":
+            return f"{st.st_size}:{st.st_mtime_ns}"
+        sha1 = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(block)
+        return f"{st.st_size}:{sha1.hexdigest()}"
+
+    def _add(self, path: str, kind: str, accessions: Iterable[str]) -> List[str]:
+        """Insert `accessions` of one `kind`; return those that were not indexed yet."""
+        cur = self._conn.cursor()
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (accession TEXT PRIMARY KEY)")
+        cur.execute("DELETE FROM incoming")
+        cur.executemany("INSERT OR IGNORE INTO incoming VALUES (?)", ((a,) for a in accessions))
+        new = [row[0] for row in cur.execute(
+            """SELECT accession FROM incoming WHERE accession NOT IN
+               (SELECT accession FROM accessions WHERE kind = ?)""", (kind,)
+        )]
+        cur.executemany("INSERT INTO accessions VALUES (?, ?, ?)", ((kind, a, path) for a in new))
+        return new
+
+    # ---------PUBLIC---------
+    def pending_files(self, dir_path: str, pattern: Optional[re.Pattern] = None) -> List[str]:
+        """Files in `dir_path` (matching `pattern`) that are new or changed since ingestion."""
+        known = dict(self._conn.execute("SELECT path, fingerprint FROM files"))
+        return [f for f in util.files_from(dir_path, pattern)
+                if known.get(os.path.abspath(f)) != self._fingerprint(f)]
+
+    def ingest_dir(
+        self,
+        dir_path: str,
+        pattern: Optional[re.Pattern] = None,
+        out_type: type = list,
+        n_jobs: int = 1,
+        chunksize: int = _HUMANN_CHUNK_ROWS
+    ) -> Tuple[Iterable, Iterable]:
+        """Parse new or changed files and return the never-seen (unirefs, uniclusts).
+
+        Each file is committed together with the accessions it added, so an
+        interrupted ingestion resumes with the first unrecorded file.
+        """
+        if n_jobs < 1:
+            raise ValueError("n_jobs must be ≥ 1")
+        files = self.pending_files(dir_path, pattern)
+        _logger.info(f"Ingesting {len(files)} new or changed file(s) from {dir_path}")
+
+        new_unirefs, new_uniclusts = [], []
+
+        def record(file: str, unirefs: set, uniclusts: set) -> None:
+            path = os.path.abspath(file)
+            added_unirefs   = self._add(path, "uniref", unirefs)
+            added_uniclusts = self._add(path, "uniclust", uniclusts)
+            self._conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                               (path, self._fingerprint(file), time.time(),
+                                len(added_unirefs), len(added_uniclusts)))
+            self._conn.commit()
+            new_unirefs.extend(added_unirefs)
+            new_uniclusts.extend(added_uniclusts)
+            _logger.info(f"{os.path.basename(file)} added {len(added_unirefs)} UniRef90(s) "
+                         f"and {len(added_uniclusts)} UniClust90(s)")
+
+        if n_jobs == 1 or len(files) <= 1:
+            for file in files:
+                record(file, *extract_accessions_from_humann(file, out_type=set, chunksize=chunksize))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = pool.map(_extract_accessions_from_files, [[f] for f in files],
+                                   [chunksize] * len(files))
+                for file, (unirefs, uniclusts) in zip(files, results):
+                    record(file, unirefs, uniclusts)
+
+        _logger.info(f"Ingestion found {len(new_unirefs)} new UniRef90(s) and {len(new_uniclusts)} new UniClust90(s)")
+        return out_type(new_unirefs), out_type(new_uniclusts)
+
+    def accessions(self, kind: str = "uniref") -> List[str]:
+        """Every indexed accession of `kind` ('uniref' or 'uniclust'), sorted."""
+        return [row[0] for row in self._conn.execute(
+            "SELECT accession FROM accessions WHERE kind = ? ORDER BY accession", (kind,)
+        )]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class UniProtClient:
+    """Pooled, keep-alive HTTP transport for the UniProt REST API.
+
+    Wraps one `requests.Session` whose connection pool is shared by every
+    request (and every worker thread) issued through the client, negotiates
+    gzip/deflate transfer encoding, and applies default (connect, read)
+    timeouts. `base_url` may point at a local stand-in server.
+    """
+
+    DEFAULT_BASE_URL = "https://rest.uniprot.org"
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        pool_maxsize: int = 10,
+        compress: bool = True
+    ):
+        if pool_maxsize < 1:
+            raise ValueError("pool_maxsize must be ≥ 1")
+        self.base_url = base_url.rstrip("/")
+        self.timeout  = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate" if compress else "identity"
+        _logger.debug(f"UniProtClient initialised (base_url={self.base_url}, "
+                      f"timeout={self.timeout}, pool_maxsize={pool_maxsize}, compress={compress})")
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def get(self, endpoint: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(self.url(endpoint), **kwargs)
+
+    def post(self, endpoint: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(self.url(endpoint), **kwargs)
+
+    def get_url(self, url: str, **kwargs) -> requests.Response:
+        """GET an absolute URL (e.g. a cursor link returned by the server)."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class UniProtRecordStore:
+    """
+    Persistent per-accession store of UniProtKB field values.
+
+    Keeps every retrieved cell in SQLite, keyed by (release, accession, field),
+    together with the TSV column label of each field, so that overlapping
+    projects can reuse earlier downloads. `release` tags the UniProt release
+    (or any other version label) the values belong to; lookups only see
+    values stored under the same tag.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the SQLite file (created if missing).
+    release : str
+        Version tag under which values are read and written.
+    """
+
+    def __init__(self, db_path: str, release: str = "current"):
+        _logger.info("Initialising UniProtRecordStore(db_path=%s, release=%s)", db_path, release)
+        self.db_path = db_path
+        self.release = release
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                release   TEXT NOT NULL,
+                accession TEXT NOT NULL,
+                field     TEXT NOT NULL,
+                value     TEXT,
+                PRIMARY KEY (release, accession, field)
+            );
+            CREATE TABLE IF NOT EXISTS field_labels (
+                field TEXT PRIMARY KEY,
+                label TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS invalid (
+                release   TEXT NOT NULL,
+                accession TEXT NOT NULL,
+                PRIMARY KEY (release, accession)
+            );
+        """)
+        self._conn.commit()
+
+    def labels(self, fields: List[str]) -> Dict[str, str]:
+        """Return the known TSV column label of each field in `fields`."""
+        marks = ",".join("?" * len(fields))
+        rows = self._conn.execute(
+            f"SELECT field, label FROM field_labels WHERE field IN ({marks})", fields
+        ).fetchall()
+        return dict(rows)
+
+    def lookup(self, accessions: List[str], fields: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+        """Return {accession: {field: value}} for every stored (accession, field) pair."""
+        found: Dict[str, Dict[str, Optional[str]]] = {}
+        field_marks = ",".join("?" * len(fields))
+        for start in range(0, len(accessions), _STORE_QUERY_CHUNK):
+            chunk = accessions[start:start + _STORE_QUERY_CHUNK]
+            acc_marks = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"""SELECT accession, field, value FROM records
+                    WHERE release = ? AND field IN ({field_marks}) AND accession IN ({acc_marks})""",
+                [self.release, *fields, *chunk]
+            )
+            for accession, field, value in rows:
+                found.setdefault(accession, {})[field] = value
+        return found
+
+    def invalid(self, accessions: List[str]) -> set:
+        """Return the accessions in `accessions` that UniProt rejected as invalid."""
+        found = set()
+        for start in range(0, len(accessions), _STORE_QUERY_CHUNK):
+            chunk = accessions[start:start + _STORE_QUERY_CHUNK]
+            acc_marks = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT accession FROM invalid WHERE release = ? AND accession IN ({acc_marks})",
+                [self.release, *chunk]
+            )
+            found.update(acc for acc, in rows)
+        return found
+
+    def put_invalid(self, accessions: List[str]) -> None:
+        """Remember `accessions` as rejected by UniProt so that they are not requested again."""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO invalid VALUES (?, ?)", ((self.release, acc) for acc in accessions)
+        )
+        self._conn.commit()
+
+    def put(self, df: pd.DataFrame, fields: List[str]) -> None:
+        """Store a TSV-shaped frame whose columns correspond positionally to `fields`.
+
+        The column of the `accession` field keys the rows.
+        """
+        if len(df.columns) != len(fields):
+            raise ValueError(f"Expected {len(fields)} column(s) for {fields}, got {list(df.columns)}")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO field_labels VALUES (?, ?)", zip(fields, df.columns)
+        )
+        accessions = df.iloc[:, fields.index("accession")].tolist()
+        columns = [
+            [None if pd.isna(value) else str(value) for value in df.iloc[:, i].tolist()]
+            for i in range(len(fields))
+        ]
+        rows = (
+            (self.release, acc, field, values[row])
+            for row, acc in enumerate(accessions)
+            for field, values in zip(fields, columns)
+        )
+        self._conn.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)", rows)
+        self._conn.commit()
+        _logger.debug("Stored %d record(s) under release %s", len(df), self.release)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _TokenBucket:
+    """Thread-safe token bucket shared by every in-flight UniProt request.
+
+    Each `acquire` reserves one token and sleeps until it becomes available,
+    so `rate` is an upper bound on the request throughput no matter how many
+    worker threads draw from the same bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rps must be > 0")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._local.waited = getattr(self._local, "waited", 0.0) + wait
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every subsequent `acquire` for at least `seconds`."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def waited(self) -> float:
+        """Seconds the calling thread has slept in `acquire` so far."""
+        return getattr(self._local, "waited", 0.0)
+
+    def on_success(self, latency: float) -> None:
+        """Feedback hook: a request completed in `latency` seconds (limiter waits excluded)."""
+
+    def on_error(self, exc: Exception) -> None:
+        """Feedback hook: a request failed; honors a `Retry-After` sent with throttling."""
+        delay = _retry_after(exc)
+        if delay:
+            _logger.info(f"Server asked to retry after {delay:.1f}s; pausing requests")
+            self.pause(delay)
+
+
+class _AdaptiveRateLimiter(_TokenBucket):
+    """Token bucket whose rate and concurrency follow AIMD feedback.
+
+    While requests succeed and the recent latency stays within `_ADAPTIVE_SLOW_LATENCY`
+    times the long-run latency, the rate grows by one request per second and
+    the concurrency by one slot per round of `concurrency` successes.
+    Throttling and transient errors halve both, at most once per
+    `_ADAPTIVE_COOLDOWN` (and honor `Retry-After`).
+    """
+
+    def __init__(self, rate: float, max_workers: int):
+        super().__init__(rate)
+        self.max_workers = max_workers
+        self._concurrency = float(max(1, max_workers // 2))
+        self._recent_latency: Optional[float] = None
+        self._longrun_latency: Optional[float] = None
+        self._last_decrease = float("-inf")
+
+    @property
+    def concurrency(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return int(self._concurrency)
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            if self._recent_latency is None:
+                self._recent_latency = self._longrun_latency = latency
+            fast, slow = _ADAPTIVE_LATENCY_SMOOTH
+            self._recent_latency  += fast * (latency - self._recent_latency)
+            self._longrun_latency += slow * (latency - self._longrun_latency)
+            if self._recent_latency > _ADAPTIVE_SLOW_LATENCY * self._longrun_latency:
+                return # the server is slowing down; hold the current pace
+            self._refill()
+            step = 1.0 / max(1.0, self._concurrency)
+            self.rate = min(_ADAPTIVE_MAX_RPS, self.rate + step)
+            self._concurrency = min(self.max_workers, self._concurrency + step)
+
+    def on_error(self, exc: Exception) -> None:
+        decreased = False
+        if _is_transient(exc):
+            with self._lock:
+                # checked under the lock so that one burst of errors halves the rate once
+                now = time.monotonic()
+                if now - self._last_decrease >= _ADAPTIVE_COOLDOWN:
+                    self._last_decrease = now
+                    self._refill()
+                    self.rate = max(_ADAPTIVE_MIN_RPS, self.rate * _ADAPTIVE_DECREASE)
+                    self._concurrency = max(1.0, self._concurrency * _ADAPTIVE_DECREASE)
+                    decreased = True
+        if decreased:
+            _logger.info(f"Throttled ({exc}); rate lowered to {self.rate:.2f} rps, "
+                         f"concurrency to {self.concurrency}")
+        super().on_error(exc)
+
+
+def _make_limiter(rps: float, adaptive: bool, max_workers: int) -> _TokenBucket:
+    if adaptive:
+        return _AdaptiveRateLimiter(rps, max_workers)
+    return _TokenBucket(rps)
+
+
+class _Request(NamedTuple):
+    """One scheduled UniProt request: `ids` start at `pos` in the input list."""
+    pos: int
+    ids: List[str]
+    engine: str
+    depth: int = 0    # number of bisections that produced this request
+    attempt: int = 0  # transient failures so far
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds requested by the `Retry-After` header of a failed response, if any."""
+    response = getattr(exc, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(_MAX_BACKOFF, max(0.0, delay))
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Whether `exc` is worth retrying unchanged (throttling, server errors, timeouts)."""
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in _TRANSIENT_STATUS_CODES or exc.response.status_code >= 500
+    return False
+
+
+def _drop_empty_rows(data: Union[pa.Table, pa.RecordBatch]) -> Union[pa.Table, pa.RecordBatch]:
+    if data.num_rows == 0 or data.num_columns == 0:
+        return data
+    return data.filter(functools.reduce(pc.or_, (pc.is_valid(col) for col in data.columns)))
+
+
+def _read_tsv_arrow(resp: requests.Response) -> pa.Table:
+    """Decode a streamed TSV response block by block into an Arrow table.
+
+    Columns get a fixed type per label (`_STREAM_COLUMN_TYPES`, `string`
+    otherwise) rather than an inferred one, so that tables from different
+    responses share one schema and numeric fields match the DataFrame path.
+    """
+    resp.raw.decode_content = True # let urllib3 gunzip while we read
+    header = resp.raw.readline().decode("utf-8").rstrip("\r\n")
+    if not header:
+        return pa.table({})
+    names  = header.split("\t")
+    schema = pa.schema([(name, _STREAM_COLUMN_TYPES.get(name, pa.string())) for name in names])
+    reader = pa_csv.open_csv(
+        resp.raw,
+        read_options=pa_csv.ReadOptions(column_names=names, block_size=_STREAM_BLOCK_SIZE),
+        parse_options=pa_csv.ParseOptions(delimiter="\t"),
+        convert_options=pa_csv.ConvertOptions(column_types=schema, strings_can_be_null=True),
+    )
+    return pa.Table.from_batches([_drop_empty_rows(batch) for batch in reader], schema=schema)
+
+
+def _read_tsv(resp: requests.Response, as_arrow: bool) -> Union[pd.DataFrame, pa.Table]:
+    if as_arrow:
+        return _read_tsv_arrow(resp)
+    df = pd.read_csv(io.StringIO(resp.text), sep="\t", na_values=[""], keep_default_na=True)
+    df.dropna(how="all", inplace=True)
+    return df
+
+
+def _search_request(
+    batch: List[str],
+    requested_fields: str,
+    client: UniProtClient,
+    limiter: _TokenBucket,
+    as_arrow: bool = False
+) -> Union[pd.DataFrame, pa.Table]:
+    """Run one OR-joined UniProtKB search request; raise on failure.
+
+    The response is parsed into a DataFrame, or streamed into an Arrow table if `as_arrow`.
+    """
+    params = {
+        "format": "tsv",
+        "size":   len(batch),
+        "query":  " OR ".join(f"accession:{uid}" for uid in batch),
+        "fields": requested_fields,
+    }
+
+    limiter.acquire()
+    with client.get("uniprotkb/search", params=params, stream=True) as resp:
+        resp.raise_for_status()
+        # ---------to-table-conversion-and-minor-cleaning---------
+        return _read_tsv(resp, as_arrow)
+
+
+def _idmapping_request(
+    batch: List[str],
+    requested_fields: str,
+    client: UniProtClient,
+    limiter: _TokenBucket,
+    as_arrow: bool = False,
+    page_size: int = 500
+) -> Union[pd.DataFrame, pa.Table]:
+    """Resolve `batch` through one UniProt ID-mapping job and page through its results.
+
+    Submits the accessions as a single job, polls until it finishes, then follows
+    the `Link: rel="next"` cursor of the TSV results endpoint, parsing every page
+    as it arrives. Rows are put back in `batch` order and the job's `From` column
+    is dropped, so the output matches `_search_request`. Raises on failure.
+    """
+    limiter.acquire()
+    resp = client.post("idmapping/run",
+                       data={"from": "UniProtKB_AC-ID", "to": "UniProtKB", "ids": ",".join(batch)})
+    resp.raise_for_status()
+    job_id = resp.json()["jobId"]
+    _logger.debug(f"Submitted ID mapping job {job_id} for {len(batch)} ID(s)")
+
+    while True:
+        limiter.acquire()
+        resp = client.get(f"idmapping/status/{job_id}", allow_redirects=False)
+        resp.raise_for_status()
+        status = resp.json().get("jobStatus") if resp.status_code == 200 else None
+        if status in ("NEW", "RUNNING"):
+            time.sleep(_IDMAPPING_POLL_INTERVAL)
+            continue
+        if status is not None and status != "FINISHED":
+            raise RuntimeError(f"ID mapping job {job_id} ended with status {status}")
+        break
+
+    pages  = []
+    url    = client.url(f"idmapping/uniprotkb/results/{job_id}")
+    params = {"format": "tsv", "fields": requested_fields, "size": page_size}
+    while url:
+        limiter.acquire()
+        with client.get_url(url, params=params, stream=True) as resp:
+            resp.raise_for_status()
+            page = _read_tsv(resp, as_arrow)
+        if len(page):
+            pages.append(page)
+        url    = resp.links.get("next", {}).get("url")
+        params = None # the cursor link already carries the query
+        _logger.debug(f"ID mapping job {job_id}: received {sum(len(p) for p in pages)} row(s) so far")
+
+    if not pages:
+        return pa.table({}) if as_arrow else pd.DataFrame()
+    if as_arrow:
+        table = pa.concat_tables(pages)
+        order = pc.index_in(table["From"], value_set=pa.array(batch, pa.string()))
+        return _drop_empty_rows(table.take(pc.sort_indices(order)).drop_columns(["From"]))
+    df = pd.concat(pages, ignore_index=True)
+    order = {uid: i for i, uid in enumerate(batch)}
+    df = (df.iloc[df["From"].map(order).argsort(kind="stable")]
+            .drop(columns="From")
+            .reset_index(drop=True))
+    df.dropna(how="all", inplace=True)
+    return df
+
+
+def _run_request(
+    request: _Request,
+    requested_fields: str,
+    client: UniProtClient,
+    limiter: _TokenBucket,
+    as_arrow: bool
+) -> Union[pd.DataFrame, pa.Table]:
+    if request.attempt:
+        # exponential back-off before retrying a transient failure
+        time.sleep(min(_MAX_BACKOFF, 2 ** (request.attempt - 1)))
+    started, waited = time.monotonic(), limiter.waited()
+    try:
+        if request.engine == "idmapping":
+            data = _idmapping_request(request.ids, requested_fields, client, limiter, as_arrow)
+        else:
+            data = _search_request(request.ids, requested_fields, client, limiter, as_arrow)
+    except Exception as exc:
+        limiter.on_error(exc)
+        raise
+    limiter.on_success(time.monotonic() - started - (limiter.waited() - waited))
+    return data
+
+
+def _load_quarantine(path: Optional[str]) -> set[str]:
+    if path is None or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _extend_quarantine(path: Optional[str], ids: List[str]) -> None:
+    if path is None or not ids:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(f"{uid}\n" for uid in ids)
+    _logger.info(f"Quarantined {len(ids)} invalid ID(s) in {path}")
+
+
+def _validate_fetch_args(request_size: int, max_workers: int, engine: str) -> None:
+    if request_size < 1:
+        raise ValueError("request_size must be ≥ 1")
+    if max_workers < 1:
+        raise ValueError("max_workers must be ≥ 1")
+    if engine not in RETRIEVAL_ENGINES:
+        raise ValueError(f"engine must be one of {RETRIEVAL_ENGINES}")
+    if engine == "idmapping" and request_size > _IDMAPPING_MAX_IDS:
+        raise ValueError(f"request_size must be ≤ {_IDMAPPING_MAX_IDS} with the 'idmapping' engine")
+
+
+def _skip_quarantined(uniref_ids: List[str], quarantine_path: Optional[str]) -> List[str]:
+    skip = _load_quarantine(quarantine_path)
+    if not skip:
+        return uniref_ids
+    kept = [uid for uid in uniref_ids if uid not in skip]
+    _logger.info(f"Skipping {len(uniref_ids) - len(kept)} quarantined ID(s)")
+    return kept
+
+
 def fetch_uniprotkb_fields(
     uniref_ids: List[str],
     fields: List[str],
     request_size: int = 100,
     rps: float = 10,
     max_retry: Optional[int | float] = float("inf"),
-    __subroutine_call_counts: int = 0
+    max_workers: int = 1,
+    client: Optional[UniProtClient] = None,
+    engine: str = "search",
+    store: Optional[UniProtRecordStore] = None,
+    quarantine_path: Optional[str] = None,
+    adaptive: bool = False
 ) -> pd.DataFrame:
     """Fetch selected UniProtKB fields for a list of accessions with batched requests.
 
-    Sends batched queries to the UniProtKB REST API, rate-limited to `rps`,
-    halves the batch size and retries on HTTP errors up to `max_retry`, and
-    concatenates results into a single DataFrame (or empty with given columns).
+    Sends batched queries to the UniProtKB REST API through a token bucket
+    limited to `rps` requests per second, keeping up to `max_workers` requests
+    in flight, and concatenates results in input order into a single
+    DataFrame (or empty with given columns). Requests go through `client`
+    (a pooled `UniProtClient`); a temporary one is opened if none is given.
+
+    Failed requests are rescheduled on the same pool as the regular batches:
+    transient failures (429, 5xx, timeouts) are retried with back-off, other
+    HTTP errors split the batch in halves (at most `max_retry` times) until
+    the offending IDs are isolated. Single IDs that keep failing that way are
+    appended to `quarantine_path` (if given), and IDs listed there are skipped.
+
+    `engine` selects how each batch of `request_size` IDs is retrieved:
+    "search" sends one OR-joined accession query; "idmapping" submits the batch
+    as an ID-mapping job (up to 100,000 IDs) and pages through its results with
+    cursor links, so one logical request can return tens of thousands of rows.
+
+    If a `store` is given, it is consulted first: only accessions (and fields)
+    it does not hold are requested, and everything retrieved is added to it.
+
+    With `adaptive=True`, `rps` is only the starting rate: it and the number of
+    requests in flight (up to `max_workers`) grow while responses stay fast and
+    are halved on throttling. A `Retry-After` header pauses all requests either way.
     """
-    if request_size < 1:
-        raise ValueError("request_size must be ≥ 1")
+    limiter = _make_limiter(rps, adaptive, max_workers)
+    df, _, _ = _fetch_uniprotkb_fields(uniref_ids, fields, request_size, limiter, max_retry,
+                                       max_workers, client, engine, store, quarantine_path)
+    return df
 
-    if __subroutine_call_counts == 0:
-        _logger.info(f"Started retrieving {fields} for {len(uniref_ids)} ID(s)")
 
-    dfs: list[pd.DataFrame] = []
-    total_ids       = len(uniref_ids)
-    total_requests  = ceil(total_ids / request_size)
+def _fetch_uniprotkb_fields(
+    uniref_ids: List[str],
+    fields: List[str],
+    request_size: int,
+    limiter: _TokenBucket,
+    max_retry: int | float,
+    max_workers: int,
+    client: Optional[UniProtClient],
+    engine: str,
+    store: Optional[UniProtRecordStore] = None,
+    quarantine_path: Optional[str] = None
+) -> Tuple[pd.DataFrame, List[str], List[str]]:
+    """Implementation of `fetch_uniprotkb_fields`.
 
-    # ---------Batched-data-retrieval---------
-    requested_fields = ",".join(fields)
-    for request_id, start in enumerate(range(0, total_ids, request_size), start=1):
-        end   = start + request_size
-        batch = uniref_ids[start:end]
+    Also returns the IDs that could not be retrieved and the IDs quarantined by this call.
+    """
+    _validate_fetch_args(request_size, max_workers, engine)
+    uniref_ids = _skip_quarantined(uniref_ids, quarantine_path)
 
-        if __subroutine_call_counts == 0:
-            _logger.info(f"Processed {(request_id - 1)}/{total_requests} requests; Querying {len(batch)} ID(s)…")
+    if store is None:
+        df, failed, invalid = _fetch_from_uniprot(uniref_ids, fields, request_size, limiter, max_retry,
+                                                  max_workers, client, engine)
+        _extend_quarantine(quarantine_path, invalid)
+        return df, failed, invalid
 
-        params = {
-            "format": "tsv",
-            "size":   len(batch),
-            "query":  " OR ".join(f"accession:{uid}" for uid in batch),
-            "fields": requested_fields,
-        }
+    # ---------consult-the-store---------
+    known_invalid = store.invalid(list(uniref_ids))
+    cached = store.lookup(list(uniref_ids), fields)
+    labels = store.labels(fields)
+    hits   = [uid for uid in uniref_ids if len(cached.get(uid, ())) == len(fields)]
+    misses = [uid for uid in uniref_ids
+              if len(cached.get(uid, ())) < len(fields) and uid not in known_invalid]
+    _logger.info(f"Record store (release={store.release}): {len(hits)} hit(s), {len(misses)} miss(es), "
+                 f"{len(known_invalid)} known invalid")
 
-        start_time = time.perf_counter()
-        try:
-            resp = requests.get("https://rest.uniprot.org/uniprotkb/search",
-                                params=params, timeout=30)
-            resp.raise_for_status()
+    # only request the fields the misses lack; the accession keys the rows
+    missing_fields = [f for f in fields if f != "accession"
+                      and any(f not in cached.get(uid, {}) for uid in misses)]
+    fetch_fields = ["accession", *missing_fields]
+    failed: list[str] = []
+    invalid: list[str] = []
+    rows: list[Tuple[str, dict]] = []
+    if misses:
+        # the misses are only a subset: judge "every ID rejected" against the full request
+        fresh, failed, invalid = _fetch_from_uniprot(misses, fetch_fields, request_size, limiter, max_retry,
+                                                     max_workers, client, engine, total_ids=len(uniref_ids))
+        _extend_quarantine(quarantine_path, invalid)
+        store.put_invalid(invalid)
+        if not fresh.empty:
+            store.put(fresh, fetch_fields)
+            labels.update(zip(fetch_fields, fresh.columns))
+            for values in fresh.itertuples(index=False):
+                record = dict(cached.get(values[0], {}))
+                record.update(zip(fetch_fields, values))
+                rows.append((values[0], record))
 
-        except requests.HTTPError as e:
-            _logger.warning(f"HTTP error on request number {request_id}: {e}")
-            if request_size <= 1 or __subroutine_call_counts >= max_retry:
-                _logger.warning(f"Couldn't retrieve data for {batch}\nDropping and moving on")
-            else:
-                new_size = max(1, request_size // 2)
-                sub_df   = fetch_uniprotkb_fields(
-                    uniref_ids            = batch,
-                    fields                = fields,
-                    request_size          = new_size,
-                    rps                   = rps,
-                    max_retry             = max_retry,
-                    __subroutine_call_counts = __subroutine_call_counts + 1,
-                )
-                if not sub_df.empty:
-                    dfs.append(sub_df)
-            continue
+    # ---------assemble-in-input-order---------
+    position = {uid: i for i, uid in enumerate(uniref_ids)}
+    rows.extend((uid, cached[uid]) for uid in hits)
+    rows.sort(key=lambda r: position.get(r[0], len(position)))
+    if not rows:
+        return pd.DataFrame(columns=fields), failed, invalid
+    df = pd.DataFrame([[r.get(f) for f in fields] for _, r in rows],
+                      columns=[labels.get(f, f) for f in fields])
+    # round-trip through TSV so dtypes match those of a direct download
+    df = pd.read_csv(io.StringIO(df.to_csv(sep="\t", index=False)), sep="\t",
+                     na_values=[""], keep_default_na=True)
+    return df, failed, invalid
 
-        except Exception as e:
-            _logger.error(f"Unexpected error on batch {request_id}: {e}")
-            continue
 
-        # ---------to-df-conversion-and-minor-cleaning---------
-        file_view = io.StringIO(resp.text)
-        df = pd.read_csv(file_view, sep="\t", na_values=[""], keep_default_na=True)
-        df.dropna(how="all", inplace=True)
+def _fetch_from_uniprot(
+    uniref_ids: List[str],
+    fields: List[str],
+    request_size: int,
+    limiter: _TokenBucket,
+    max_retry: int | float,
+    max_workers: int,
+    client: Optional[UniProtClient],
+    engine: str,
+    total_ids: Optional[int] = None
+) -> Tuple[pd.DataFrame, List[str], List[str]]:
+    """Retrieve `fields` for `uniref_ids` from the UniProt REST API.
+
+    Returns (data in input order, failed IDs, invalid IDs).
+    """
+    results: Dict[int, pd.DataFrame] = {}
+
+    def collect(pos: int, df: pd.DataFrame) -> None:
         if not df.empty:
-            dfs.append(df)
+            results[pos] = df
+
+    failed, invalid = _schedule_requests(uniref_ids, fields, request_size, limiter, max_retry,
+                                         max_workers, client, engine, collect, total_ids=total_ids)
+
+    dfs = [results[pos] for pos in sorted(results)]
+    df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(columns=fields)
+    return df, failed, invalid
+
+
+def _schedule_requests(
+    uniref_ids: List[str],
+    fields: List[str],
+    request_size: int,
+    limiter: _TokenBucket,
+    max_retry: int | float,
+    max_workers: int,
+    client: Optional[UniProtClient],
+    engine: str,
+    on_result: Callable[[int, Any], None],
+    as_arrow: bool = False,
+    total_ids: Optional[int] = None
+) -> Tuple[List[str], List[str]]:
+    """Run every request needed to retrieve `fields` for `uniref_ids`.
+
+    Runs an iterative scheduler over a thread pool: the initial batches and
+    every retry or bisection spawned by a failure share the same workers and
+    rate `limiter` (which may also cap the number of requests in flight).
+    Each successful response is handed, on the calling thread
+    and in completion order, to `on_result(pos, data)`, where `pos` is the
+    input position of the request's first ID. Returns (failed IDs, invalid IDs).
+
+    `total_ids` is the size of the caller's full request when `uniref_ids` is
+    only part of it (e.g. the store misses); rejecting every ID of a subset
+    then does not mean the request itself is malformed.
+    """
+    _logger.info(f"Started retrieving {fields} for {len(uniref_ids)} ID(s) "
+                 f"(engine={engine}, rps={limiter.rate:.3g}, max_workers={max_workers})")
+
+    failed: list[str] = []
+    invalid: list[str] = []
+    requested_fields = ",".join(fields)
+
+    # ---------Batched-data-retrieval---------
+    queue = deque(_Request(start, uniref_ids[start:start + request_size], engine)
+                  for start in range(0, len(uniref_ids), request_size))
+    total_requests = len(queue)
+    processed      = 0
+    retrieved_ids  = 0
+    started        = time.monotonic()
+
+    owns_client = client is None
+    if owns_client:
+        client = UniProtClient(pool_maxsize=max_workers)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            in_flight: Dict[Future, _Request] = {}
+            while queue or in_flight:
+                while queue and len(in_flight) < getattr(limiter, "concurrency", max_workers):
+                    request = queue.popleft()
+                    in_flight[pool.submit(_run_request, request, requested_fields,
+                                          client, limiter, as_arrow)] = request
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    request = in_flight.pop(future)
+                    processed += 1
+                    exc = future.exception()
+
+                    if exc is None:
+                        on_result(request.pos, future.result())
+                        retrieved_ids += len(request.ids)
+
+                    elif _is_transient(exc) and request.attempt < _MAX_TRANSIENT_RETRIES:
+                        _logger.warning(f"Transient error on {len(request.ids)} ID(s) ({exc}); retrying")
+                        queue.append(request._replace(attempt=request.attempt + 1))
+                        total_requests += 1
+
+                    elif request.engine == "idmapping" and not _is_transient(exc):
+                        _logger.warning(f"ID mapping failed for {len(request.ids)} ID(s) ({exc}); "
+                                        "falling back to search queries")
+                        queue.extend(
+                            _Request(request.pos + i, request.ids[i:i + _SEARCH_FALLBACK_SIZE], "search")
+                            for i in range(0, len(request.ids), _SEARCH_FALLBACK_SIZE)
+                        )
+                        total_requests += ceil(len(request.ids) / _SEARCH_FALLBACK_SIZE)
+
+                    elif _is_transient(exc) or not isinstance(exc, requests.HTTPError):
+                        _logger.error(f"Couldn't retrieve data for {len(request.ids)} ID(s): {exc}")
+                        failed.extend(request.ids)
 
-        elapsed = time.perf_counter() - start_time
-        time.sleep(max(0, 1.0 / rps - elapsed))
+                    elif len(request.ids) == 1:
+                        _logger.warning(f"Invalid ID {request.ids[0]} ({exc}); quarantining")
+                        invalid.extend(request.ids)
+
+                    elif request.depth >= max_retry:
+                        _logger.warning(f"Couldn't retrieve data for {request.ids}\nDropping and moving on")
+                        failed.extend(request.ids)
+
+                    else:
+                        # bisect to isolate the offending ID(s)
+                        _logger.warning(f"HTTP error on {len(request.ids)} ID(s) ({exc}); bisecting")
+                        half = len(request.ids) // 2
+                        queue.append(_Request(request.pos, request.ids[:half], "search", request.depth + 1))
+                        queue.append(_Request(request.pos + half, request.ids[half:], "search", request.depth + 1))
+                        total_requests += 2
+
+                    elapsed = max(time.monotonic() - started, 1e-9)
+                    _logger.info(f"Processed {processed}/{total_requests} requests "
+                                 f"({processed / elapsed:.2f} req/s, {retrieved_ids / elapsed:.1f} IDs/s, "
+                                 f"rate limit {limiter.rate:.2f} rps)")
+    finally:
+        if owns_client:
+            client.close()
 
     # ---------after-data-retrieval---------
-    if __subroutine_call_counts == 0:
-        _logger.info(f"Processed {request_id}/{total_requests} requests.")
-        _logger.info("Finished fetching the data")
+    if len(invalid) > 1 and len(invalid) == (total_ids or len(uniref_ids)):
+        # every single ID was rejected: the request itself (e.g. `fields`) is at fault
+        _logger.error(f"UniProt rejected every ID; check the requested fields {fields}")
+        failed.extend(invalid)
+        invalid = []
+    if failed:
+        _logger.warning(f"Could not retrieve data for {len(failed)} ID(s)")
+    if invalid:
+        _logger.warning(f"{len(invalid)} ID(s) were rejected as invalid")
+    elapsed = max(time.monotonic() - started, 1e-9)
+    _logger.info(f"Finished fetching the data: {processed} request(s) in {elapsed:.1f}s "
+                 f"({processed / elapsed:.2f} req/s, {retrieved_ids / elapsed:.1f} IDs/s)")
+
+    return failed, invalid
+
+
+def fetch_uniprotkb_fields_to_parquet(
+    uniref_ids: List[str],
+    fields: List[str],
+    path: str,
+    request_size: int = 100,
+    rps: float = 10,
+    max_retry: Optional[int | float] = float("inf"),
+    max_workers: int = 1,
+    client: Optional[UniProtClient] = None,
+    engine: str = "search",
+    quarantine_path: Optional[str] = None,
+    adaptive: bool = False
+) -> int:
+    """Stream selected UniProtKB fields for a list of accessions into a Parquet file.
+
+    Same retrieval as `fetch_uniprotkb_fields`, but each TSV response is decoded
+    incrementally into Arrow record batches and appended to an open Parquet
+    writer, so peak memory no longer grows with the result size. `Length` and
+    `Mass` are stored as int64 (as in `fetch_uniprotkb_fields`), every other
+    column as string, and rows follow request completion order.
+    `adaptive` works as in `fetch_uniprotkb_fields`. Returns the number of rows written.
+    """
+    limiter = _make_limiter(rps, adaptive, max_workers)
+    rows, _, _ = _fetch_uniprotkb_fields_to_parquet(uniref_ids, fields, path, request_size, limiter,
+                                                    max_retry, max_workers, client, engine,
+                                                    quarantine_path)
+    return rows
+
+
+def _fetch_uniprotkb_fields_to_parquet(
+    uniref_ids: List[str],
+    fields: List[str],
+    path: str,
+    request_size: int,
+    limiter: _TokenBucket,
+    max_retry: int | float,
+    max_workers: int,
+    client: Optional[UniProtClient],
+    engine: str,
+    quarantine_path: Optional[str] = None
+) -> Tuple[int, List[str], List[str]]:
+    """Implementation of `fetch_uniprotkb_fields_to_parquet`; returns (rows, failed IDs, invalid IDs)."""
+    _validate_fetch_args(request_size, max_workers, engine)
+    uniref_ids = _skip_quarantined(uniref_ids, quarantine_path)
+
+    writer: Optional[pq.ParquetWriter] = None
+    buffer: list[pa.Table] = []
+    rows_written = 0
+
+    def flush() -> None:
+        nonlocal writer, rows_written
+        table = pa.concat_tables(buffer)
+        buffer.clear()
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+        rows_written += table.num_rows
+
+    def append(pos: int, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        if buffer and table.schema != buffer[0].schema:
+            raise ValueError(f"Response columns {table.schema.names} differ from {buffer[0].schema.names}")
+        buffer.append(table)
+        if sum(t.num_rows for t in buffer) >= _STREAM_ROW_GROUP_ROWS:
+            flush()
+
+    try:
+        failed, invalid = _schedule_requests(uniref_ids, fields, request_size, limiter, max_retry,
+                                             max_workers, client, engine, append, as_arrow=True)
+        if buffer:
+            flush()
+        if writer is None:
+            pq.write_table(pa.table({f: pa.array([], pa.string()) for f in fields}), path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    _extend_quarantine(quarantine_path, invalid)
+    _logger.info(f"Streamed {rows_written} row(s) to {path}")
+    return rows_written, failed, invalid
+
+
+def _fetch_uniprotkb_table(
+    uniref_ids: List[str],
+    fields: List[str],
+    request_size: int,
+    limiter: _TokenBucket,
+    max_retry: int | float,
+    max_workers: int,
+    client: Optional[UniProtClient],
+    engine: str,
+    quarantine_path: Optional[str] = None
+) -> Tuple[pa.Table, List[str], List[str]]:
+    """Retrieve `fields` as one Arrow table typed by `_read_tsv_arrow`; returns (table, failed IDs, invalid IDs)."""
+    _validate_fetch_args(request_size, max_workers, engine)
+    uniref_ids = _skip_quarantined(uniref_ids, quarantine_path)
+
+    tables: list[pa.Table] = []
+
+    def collect(pos: int, table: pa.Table) -> None:
+        if table.num_rows:
+            tables.append(table)
+
+    failed, invalid = _schedule_requests(uniref_ids, fields, request_size, limiter, max_retry,
+                                         max_workers, client, engine, collect, as_arrow=True)
+    _extend_quarantine(quarantine_path, invalid)
+    if not tables:
+        return pa.table({f: pa.array([], pa.string()) for f in fields}), failed, invalid
+    return pa.concat_tables(tables), failed, invalid
+
 
-    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(columns=fields)
+def _dataset_partitioning() -> ds.Partitioning:
+    return ds.partitioning(pa.schema([(DATASET_PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+
+def _write_dataset_batch(
+    table: pa.Table,
+    dataset_dir: str,
+    stem: str,
+    accession_column: str,
+    prefix_length: int
+) -> List[str]:
+    """Append `table` to the hive-partitioned dataset at `dataset_dir`; returns the written files.
+
+    Rows are partitioned by the first `prefix_length` characters of `accession_column`
+    and sorted by accession, so row-group statistics also prune longer prefixes.
+    Columns with few distinct values (annotations) are dictionary-encoded.
+    Files left under the same `stem` by an earlier attempt are deleted first.
+    """
+    # write_dataset only overwrites files whose names it reuses, and an earlier attempt
+    # may have written more files or other partitions, so clear them all
+    for stale in glob.glob(os.path.join(dataset_dir, f"{DATASET_PARTITION_COLUMN}=*", f"{stem}-*.parquet")):
+        os.remove(stale)
+    if table.num_rows == 0:
+        return []
+    prefixes = pc.utf8_slice_codeunits(table[accession_column], 0, prefix_length)
+    table = table.append_column(DATASET_PARTITION_COLUMN, prefixes).sort_by(accession_column)
+    dictionary_columns = [
+        name for name in table.column_names
+        if pc.count_distinct(table[name]).as_py() <= _DATASET_DICTIONARY_MAX_RATIO * table.num_rows
+    ]
+
+    written: list[str] = []
+    ds.write_dataset(
+        table, dataset_dir,
+        format="parquet",
+        partitioning=_dataset_partitioning(),
+        basename_template=f"{stem}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore", # other batches share the partition dirs
+        file_options=ds.ParquetFileFormat().make_write_options(compression=_DATASET_COMPRESSION,
+                                                               use_dictionary=dictionary_columns),
+        min_rows_per_group=_DATASET_ROW_GROUP_ROWS,
+        max_rows_per_group=_DATASET_ROW_GROUP_ROWS,
+        file_visitor=lambda f: written.append(f.path),
+    )
+    return written
+
+
+def uniprotkb_dataset_prefixes(path: str) -> List[str]:
+    """Accession prefixes (partitions) present in a dataset written with output="dataset"."""
+    marker = f"{DATASET_PARTITION_COLUMN}="
+    return sorted(name[len(marker):] for name in os.listdir(path)
+                  if name.startswith(marker) and os.path.isdir(os.path.join(path, name)))
+
+
+def read_uniprotkb_dataset(
+    path: str,
+    accession_prefixes: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+    accession_column: str = "Entry"
+) -> pd.DataFrame:
+    """Read (a slice of) a dataset written by `fetch_save_uniprotkb_batches(output="dataset")`.
+
+    `accession_prefixes` restricts the rows to accessions starting with any of the
+    given prefixes: partitions that cannot match are never opened, and within a
+    partition, row groups are skipped using their accession min/max statistics.
+    `Length`/`Mass` are int64 (float64 if pandas sees missing values), every
+    other column is strings (missing values are None); rows are sorted by
+    accession within each partition.
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning=_dataset_partitioning())
+    expression = None
+    if accession_prefixes is not None:
+        partitions = uniprotkb_dataset_prefixes(path)
+        width = max((len(p) for p in partitions), default=0)
+        for prefix in accession_prefixes:
+            if not prefix:
+                raise ValueError("accession prefixes must be non-empty")
+            matching = [p for p in partitions if p.startswith(prefix[:width])]
+            term = ds.field(DATASET_PARTITION_COLUMN).isin(matching)
+            if len(prefix) > width:
+                # half-open accession range [prefix, next prefix) for row-group pruning
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                term &= (ds.field(accession_column) >= prefix) & (ds.field(accession_column) < upper)
+            expression = term if expression is None else expression | term
+    table = dataset.to_table(columns=columns, filter=expression)
+    if columns is None:
+        table = table.drop_columns([DATASET_PARTITION_COLUMN])
+    return table.to_pandas()
+
+
+def _ids_checksum(ids: List[str]) -> str:
+    return hashlib.sha1("\n".join(ids).encode()).hexdigest()
+
+
+def _load_manifest(
+    path: str,
+    fields: List[str],
+    batch_size: int,
+    total_ids: int,
+    output: str = "files"
+) -> Optional[Dict[str, Any]]:
+    """Load a manifest for resuming; raise if it belongs to a different run."""
+    if not os.path.exists(path):
+        _logger.info(f"No manifest found at {path}; starting from scratch")
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    expected = {"fields": fields, "batch_size": batch_size, "total_ids": total_ids, "output": output}
+    found = {k: manifest.get(k, "files" if k == "output" else None) for k in expected}
+    if found != expected:
+        raise ValueError(f"Manifest at {path} was written for a different run: "
+                         f"expected {expected}, found {found}")
+    return manifest
 
 
 def fetch_save_uniprotkb_batches(
@@ -173,48 +1313,194 @@ def fetch_save_uniprotkb_batches(
     batch_size: int,
     single_api_request_size: int = 100,
     rps: float = 10,
-    save_to_dir: Optional[str] = None
+    save_to_dir: Optional[str] = None,
+    max_workers: int = 1,
+    client: Optional[UniProtClient] = None,
+    engine: str = "search",
+    resume: bool = False,
+    store: Optional[UniProtRecordStore] = None,
+    quarantine_path: Optional[str] = None,
+    streaming: bool = False,
+    adaptive: bool = False,
+    output: str = "files",
+    dataset_prefix_length: int = 2
 ) -> str:
     """Fetch UniProtKB data in large batches and save each batch to disk.
 
     Splits `uniref_ids` into `batch_size` groups; for each group, calls
-    `fetch_uniprotkb_fields` (with `single_api_request_size` per API call),
-    then saves to Parquet (falling back to CSV). Returns the output directory.
+    `fetch_uniprotkb_fields` (with `single_api_request_size` per API call
+    and up to `max_workers` concurrent requests, using the given retrieval `engine`),
+    then saves to `batch_{id}.parquet` (falling back to CSV).
+    One pooled `client` is reused across all batches, and records already held by
+    `store` are not re-downloaded. Returns the output directory.
+
+    After every batch, `manifest.json` in `save_to_dir` is atomically rewritten with
+    the batch's accession range, status, row count, files and failed IDs. With
+    `resume=True`, completed batches from an earlier run are skipped and partial
+    ones only retry their failed IDs (saved to `batch_{id}_retry{n}.parquet`);
+    `uniref_ids` must then be in the same order as in that run. IDs rejected as
+    invalid are appended to `quarantine_path` (default: `quarantine.txt` in
+    `save_to_dir`) and skipped by later runs.
+
+    With `streaming=True`, responses are streamed straight into each batch's Parquet
+    file (see `fetch_uniprotkb_fields_to_parquet`), so `batch_size` is no longer
+    bounded by RAM; this mode cannot be combined with a `store`.
+
+    All batches share one rate limiter, so with `adaptive=True` the throughput
+    learned on one batch carries over to the next.
+
+    With `output="dataset"`, every batch is instead appended to one hive-partitioned
+    Parquet dataset in `save_to_dir/dataset`, partitioned by the first
+    `dataset_prefix_length` characters of the accession (which `fields` must include),
+    with int64 `Length`/`Mass` and string columns otherwise, zstd compression,
+    dictionary-encoded annotation columns and bounded row groups. Read it back
+    with `read_uniprotkb_dataset`. A batch written again replaces its earlier
+    files, and a run without `resume` refuses to write into a dataset that
+    already holds data. This mode cannot be combined with a `store`.
     """
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"output must be one of {OUTPUT_MODES}")
+    if output == "dataset" and "accession" not in fields:
+        raise ValueError('output="dataset" partitions by accession; include "accession" in `fields`')
+    if dataset_prefix_length < 1:
+        raise ValueError("dataset_prefix_length must be ≥ 1")
+    if (streaming or output == "dataset") and store is not None:
+        raise ValueError("`store` is not supported with streaming=True or output=\"dataset\"")
     if save_to_dir is None:
         save_to_dir = os.getcwd()
     os.makedirs(save_to_dir, exist_ok=True)
+    if quarantine_path is None:
+        quarantine_path = os.path.join(save_to_dir, QUARANTINE_FILE_NAME)
+    dataset_dir = os.path.join(save_to_dir, DATASET_DIR_NAME)
+    if output == "dataset" and not resume and glob.glob(os.path.join(dataset_dir, "**", "*.parquet"),
+                                                        recursive=True):
+        # the files of an earlier run would be read back together with the new ones
+        raise ValueError(f"{dataset_dir} already holds data; pass resume=True or use an empty `save_to_dir`")
 
     total_ids           = len(uniref_ids)
     batches_to_process  = ceil(total_ids / batch_size)
     processed_batches   = 0
 
-    for request_id, start in enumerate(range(0, total_ids, batch_size), start=1):
-        end   = start + batch_size
-        batch = uniref_ids[start:end]
+    manifest_path = os.path.join(save_to_dir, MANIFEST_FILE_NAME)
+    manifest = _load_manifest(manifest_path, fields, batch_size, total_ids, output) if resume else None
+    if manifest is None:
+        manifest = {"fields": fields, "batch_size": batch_size, "total_ids": total_ids,
+                    "output": output, "batches": {}}
 
-        _logger.info(f"Submitting {request_id}/{batches_to_process} batch of API requests with {len(batch)} entry(s)")
+    limiter = _make_limiter(rps, adaptive, max_workers)
+    owns_client = client is None
+    if owns_client:
+        client = UniProtClient(pool_maxsize=max_workers)
 
-        data = fetch_uniprotkb_fields(batch, fields,
-                                      request_size=single_api_request_size,
-                                      rps=rps)
+    try:
+        for request_id, start in enumerate(range(0, total_ids, batch_size), start=1):
+            end   = start + batch_size
+            batch = uniref_ids[start:end]
 
-        _logger.info(f"Received {len(data)} non-empty rows of data")
+            # ---------check-the-manifest---------
+            checksum = _ids_checksum(batch)
+            entry = manifest["batches"].get(str(request_id))
+            if entry is not None and entry["checksum"] != checksum:
+                raise ValueError(f"Batch {request_id} holds different IDs than recorded in {manifest_path}; "
+                                 "pass `uniref_ids` in the same order as in the interrupted run")
+            if entry is not None and entry["status"] == "completed":
+                _logger.info(f"Batch {request_id}/{batches_to_process} was already completed; Skipping")
+                processed_batches += 1
+                continue
+            if entry is None:
+                entry = {
+                    "start": start, "end": start + len(batch),
+                    "first_id": batch[0], "last_id": batch[-1],
+                    "checksum": checksum, "status": "pending",
+                    "rows": 0, "files": [], "failed_ids": [], "quarantined_ids": []
+                }
+                to_fetch = batch
+            else:
+                to_fetch = entry["failed_ids"]
+                _logger.info(f"Batch {request_id}/{batches_to_process} is partial; retrying {len(to_fetch)} failed ID(s)")
 
-        ts   = int(time.time())
-        file = os.path.join(save_to_dir, f"batch_{request_id}_{ts}.parquet")
+            _logger.info(f"Submitting {request_id}/{batches_to_process} batch of API requests with {len(to_fetch)} entry(s)")
 
-        try:
-            data.to_parquet(path=file, index=True)
-        except Exception as e:
-            _logger.warning(f"to_parquet failed ({e}); falling back to CSV")
-            file = os.path.join(save_to_dir, f"batch_{request_id}_{ts}.csv")
-            data.to_csv(file, index=True)
+            stem = f"batch_{request_id}" if not entry["files"] else f"batch_{request_id}_retry{len(entry['files'])}"
+
+            if output == "dataset":
+                # ---------append-to-the-partitioned-dataset---------
+                table, failed, invalid = _fetch_uniprotkb_table(
+                    to_fetch, fields,
+                    request_size=single_api_request_size,
+                    limiter=limiter,
+                    max_retry=float("inf"),
+                    max_workers=max_workers,
+                    client=client,
+                    engine=engine,
+                    quarantine_path=quarantine_path
+                )
+                n_rows = table.num_rows
+                _logger.info(f"Received {n_rows} non-empty rows of data")
+                written = _write_dataset_batch(table, dataset_dir, stem,
+                                               table.column_names[fields.index("accession")],
+                                               dataset_prefix_length)
+                entry["files"].extend(os.path.relpath(f, save_to_dir) for f in written)
+                _logger.info(f"The data were appended to {dataset_dir} "
+                             f"({len(written)} file(s))")
+                del table
+            elif streaming:
+                # ---------stream-the-data-to-disk---------
+                file = os.path.join(save_to_dir, f"{stem}.parquet")
+                n_rows, failed, invalid = _fetch_uniprotkb_fields_to_parquet(
+                    to_fetch, fields, file,
+                    request_size=single_api_request_size,
+                    limiter=limiter,
+                    max_retry=float("inf"),
+                    max_workers=max_workers,
+                    client=client,
+                    engine=engine,
+                    quarantine_path=quarantine_path
+                )
+                _logger.info(f"Streamed {n_rows} non-empty rows of data")
+                if entry["files"] and n_rows == 0:
+                    os.remove(file) # nothing recovered by this retry
+                else:
+                    entry["files"].append(os.path.basename(file))
+                    _logger.info(f"The data were saved at {file}")
+            else:
+                data, failed, invalid = _fetch_uniprotkb_fields(to_fetch, fields,
+                                                                request_size=single_api_request_size,
+                                                                limiter=limiter,
+                                                                max_retry=float("inf"),
+                                                                max_workers=max_workers,
+                                                                client=client,
+                                                                engine=engine,
+                                                                store=store,
+                                                                quarantine_path=quarantine_path)
+                n_rows = len(data)
+                _logger.info(f"Received {n_rows} non-empty rows of data")
+
+                # ---------save-the-data---------
+                if not entry["files"] or not data.empty:
+                    file = os.path.join(save_to_dir, f"{stem}.parquet")
+                    try:
+                        data.to_parquet(path=file, index=True)
+                    except Exception as e:
+                        _logger.warning(f"to_parquet failed ({e}); falling back to CSV")
+                        file = os.path.join(save_to_dir, f"{stem}.csv")
+                        data.to_csv(file, index=True)
+                    entry["files"].append(os.path.basename(file))
+                    _logger.info(f"The data were saved at {file}")
+                del data  # explicitly free the RAM
 
-        _logger.info(f"The data were saved at {file}")
-        del data  # explicitly free the RAM
+            # ---------update-the-manifest---------
+            entry["rows"]      += n_rows
+            entry["failed_ids"] = failed
+            entry["quarantined_ids"] = entry.get("quarantined_ids", []) + invalid
+            entry["status"]     = "partial" if failed else "completed"
+            manifest["batches"][str(request_id)] = entry
+            util.write_manifest(manifest_path, manifest)
 
-        processed_batches += 1
+            processed_batches += 1
+    finally:
+        if owns_client:
+            client.close()
 
     if processed_batches < batches_to_process:
         _logger.error(f"Did not manage to process all the batches of UniProt requests: only {processed_batches}/{batches_to_process} were processed")
@@ -223,10 +1509,16 @@ def fetch_save_uniprotkb_batches(
 
 
 __all__ = [
+    "AccessionIndex",
+    "UniProtClient",
+    "UniProtRecordStore",
     "extract_accessions_from_humann",
     "extract_all_accessions_from_dir",
     "fetch_uniprotkb_fields",
-    "fetch_save_uniprotkb_batches"
+    "fetch_uniprotkb_fields_to_parquet",
+    "fetch_save_uniprotkb_batches",
+    "read_uniprotkb_dataset",
+    "uniprotkb_dataset_prefixes"
 ]
 
 if __name__ == "__main__":
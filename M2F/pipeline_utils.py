@@ -0,0 +1,365 @@
+# builtins:
+import os
+import json
+import logging
+from collections import Counter
+from typing import List, Optional, Dict, Iterator, Union, Any
+
+# third-party:
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# local:
+from .cleaning_utils import CleaningMemo, TokenVocabulary, clean_cols
+from .embedding_utils import AAChainEmbedder, FreeTXTEmbedder
+from .feature_engineering_utils import (embed_ft_domains,
+                                        embed_AAsequences,
+                                        embed_freetxt_cols,
+                                        encode_go,
+                                        encode_ec,
+                                        encode_multihot,
+                                        fit_go_term_counts,
+                                        fit_ec_term_counts,
+                                        save_df,
+                                        load_df)
+from . import util
+
+# *-----------------------------------------------*
+#                      GLOBALS
+# *-----------------------------------------------*
+
+_logger = logging.getLogger(__name__)
+
+PIPELINE_MANIFEST_FILE_NAME = "pipeline_manifest.json"
+PART_FILE_TEMPLATE          = "part-{:05d}.zip"
+
+_SAMPLE_ROWS           = 1_000  # rows read to estimate the per-row memory footprint
+_FIT_CHUNK_ROWS        = 50_000 # rows per chunk when fitting (label columns only)
+_MEMORY_SAFETY_FACTOR  = 3      # raw + cleaned cells, embedder intermediates, save_df's sorted copy
+_VECTOR_OVERHEAD_BYTES = 112    # ndarray object header of one embedded cell
+
+# *-----------------------------------------------*
+#                      UTILS
+# *-----------------------------------------------*
+
+def _iter_chunks(path: str, columns: List[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield `chunk_rows`-row DataFrames of `columns` from a Parquet or CSV file."""
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        with pd.read_csv(path, usecols=columns, chunksize=chunk_rows) as reader:
+            yield from reader
+
+
+def _count_terms(values: pd.Series, counts: Counter) -> None:
+    """Add the occurrences of every label of a cleaned column (tuples or Arrow lists) to `counts`."""
+    if isinstance(values.dtype, pd.ArrowDtype):
+        value_counts = pc.value_counts(pc.list_flatten(pa.array(values)))
+        labels = value_counts.field(0)
+        if pa.types.is_dictionary(labels.type):
+            labels = labels.cast(pa.string())
+        counts.update(dict(zip(labels.to_pylist(), value_counts.field(1).to_pylist())))
+    else:
+        for labels in values:
+            if isinstance(labels, tuple):
+                counts.update(labels)
+
+# *-----------------------------------------------*
+#                      MAIN
+# *-----------------------------------------------*
+
+class StreamingPreprocessor:
+    """
+    Chunked clean → embed → encode → save pipeline for raw UniProt CSV/Parquet files.
+
+    `fit(paths)` makes one light pass over the label columns (GO, EC, multi-hot) to fix
+    their depth and label→index maps, so every chunk is encoded into the same index space
+    a whole-file run would produce. `transform(path, out_dir)` then reads the file in row
+    chunks sized to `memory_budget_mb`, runs every stage on one chunk at a time and writes
+    each chunk to its own `part-XXXXX.zip` (`save_df` layout) as soon as it is done.
+
+    Parameters
+    ----------
+    col_names : list[str]
+        Columns to clean and process; apart from "Entry", no other column is read.
+        Each one must be consumed by a stage below.
+    apply_norms, apply_strip_pubmeds : dict[str, bool] | None
+        Per-column cleaning flags, as in `clean_cols`.
+    aa_embedder : AAChainEmbedder | None
+        Embeds "Sequence" and, if listed, "Domain [FT]".
+    txt_embedder : FreeTXTEmbedder | None
+        Embeds the `freetxt_cols`.
+    freetxt_cols, go_cols, ec_cols, multihot_cols : list[str] | None
+        Columns for `embed_freetxt_cols`, `encode_go`, `encode_ec` and `encode_multihot`.
+    go_coverage_target : float
+        Passed to the GO depth auto-selection.
+    memory_budget_mb : float
+        Approximate peak memory of one chunk; sets the chunk size unless `chunk_rows` is given.
+    chunk_rows : int | None
+        Fixed number of rows per chunk.
+    engine : str
+        Cleaning engine, see `clean_col`.
+    output : str
+        "tuple", "arrow" (Arrow `list<string>` cleaned columns) or "codes"
+        (dictionary-coded lists), see `clean_col`.
+    memo : CleaningMemo | None
+        Memo for the label columns, shared by `fit` and `transform` (a new one if None).
+    vocab : TokenVocabulary | None
+        Token codes for `output="codes"`, shared by every chunk (a new one if None).
+    """
+
+    def __init__(
+        self,
+        col_names: List[str],
+        apply_norms: Optional[Dict[str, bool]] = None,
+        apply_strip_pubmeds: Optional[Dict[str, bool]] = None,
+        aa_embedder: Optional[AAChainEmbedder] = None,
+        txt_embedder: Optional[FreeTXTEmbedder] = None,
+        freetxt_cols: Optional[List[str]] = None,
+        go_cols: Optional[List[str]] = None,
+        ec_cols: Optional[List[str]] = None,
+        multihot_cols: Optional[List[str]] = None,
+        go_coverage_target: float = 0.8,
+        memory_budget_mb: float = 2048,
+        chunk_rows: Optional[int] = None,
+        aa_batch_size: int = 128,
+        txt_batch_size: int = 1000,
+        engine: str = "python",
+        output: str = "tuple",
+        memo: Optional[CleaningMemo] = None,
+        vocab: Optional[TokenVocabulary] = None
+    ):
+        self.col_names = list(dict.fromkeys(col_names))
+        self.apply_norms = apply_norms or {}
+        self.apply_strip_pubmeds = apply_strip_pubmeds or {}
+        self.aa_embedder = aa_embedder
+        self.txt_embedder = txt_embedder
+        self.freetxt_cols = list(freetxt_cols or [])
+        self.go_cols = list(go_cols or [])
+        self.ec_cols = list(ec_cols or [])
+        self.multihot_cols = list(multihot_cols or [])
+        self.go_coverage_target = go_coverage_target
+        self.memory_budget_mb = memory_budget_mb
+        self.chunk_rows = chunk_rows
+        self.aa_batch_size = aa_batch_size
+        self.txt_batch_size = txt_batch_size
+        self.engine = engine
+        self.output = output
+        self.memo = memo if memo is not None else CleaningMemo()
+        self.vocab = vocab if vocab is not None else TokenVocabulary()
+        self.encoders_meta: Optional[Dict[str, Dict[str, Any]]] = None
+
+        if memory_budget_mb <= 0:
+            raise ValueError(f"memory_budget_mb must be positive, received {memory_budget_mb}")
+        if chunk_rows is not None and chunk_rows < 1:
+            raise ValueError("chunk_rows must be ≥ 1")
+
+        embedded = set()
+        if aa_embedder is not None:
+            embedded |= {"Sequence", "Domain [FT]"}
+            if "Domain [FT]" in self.col_names and "Sequence" not in self.col_names:
+                raise ValueError("'Domain [FT]' embedding needs 'Sequence' in col_names")
+        if self.freetxt_cols:
+            if txt_embedder is None:
+                raise ValueError("freetxt_cols were given without a txt_embedder")
+            embedded |= set(self.freetxt_cols)
+        consumed = embedded | set(self._label_cols)
+        unknown = [c for c in consumed - {"Sequence", "Domain [FT]"} if c not in self.col_names]
+        if unknown:
+            raise ValueError(f"Columns not in col_names: {sorted(unknown)}")
+        unhandled = [c for c in self.col_names if c not in consumed]
+        if unhandled:
+            raise ValueError(f"No embedding or encoding stage for columns: {unhandled}")
+
+    # ---------PROTECTED---------
+    @property
+    def _label_cols(self) -> List[str]:
+        return list(dict.fromkeys(self.go_cols + self.ec_cols + self.multihot_cols))
+
+    @property
+    def _read_cols(self) -> List[str]:
+        return list(dict.fromkeys(["Entry", *self.col_names]))
+
+    def _clean(self, df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+        label_cols = [c for c in cols if c in self._label_cols]
+        other_cols = [c for c in cols if c not in label_cols]
+        # label values repeat across rows and chunks, so they go through the memo
+        for names, memo in ((label_cols, self.memo), (other_cols, None)):
+            if names:
+                clean_cols(df, names, apply_norms=self.apply_norms, apply_strip_pubmeds=self.apply_strip_pubmeds,
+                           inplace=True, engine=self.engine, memo=memo, output=self.output, vocab=self.vocab)
+        return df
+
+    def _dense_dims(self) -> List[int]:
+        dims = []
+        if self.aa_embedder is not None:
+            dim = self.aa_embedder.model.config.hidden_size
+            dims += [dim for c in ("Sequence", "Domain [FT]") if c in self.col_names]
+        if self.txt_embedder is not None:
+            dims += [FreeTXTEmbedder.DIMENSIONS[self.txt_embedder.model]] * len(self.freetxt_cols)
+        return dims
+
+    def _process(self, df: pd.DataFrame) -> pd.DataFrame:
+        self._clean(df, self.col_names)
+        if self.aa_embedder is not None:
+            if "Domain [FT]" in df.columns:
+                embed_ft_domains(df, self.aa_embedder, batch_size=self.aa_batch_size, inplace=True)
+            if "Sequence" in df.columns:
+                embed_AAsequences(df, self.aa_embedder, batch_size=self.aa_batch_size, inplace=True)
+        if self.freetxt_cols:
+            embed_freetxt_cols(df, self.freetxt_cols, self.txt_embedder, batch_size=self.txt_batch_size, inplace=True)
+        for col in self.go_cols:
+            meta = self.encoders_meta[col]
+            encode_go(df, col, depth=meta["depth"], class_labels=meta["class_labels"], inplace=True)
+        for col in self.ec_cols:
+            meta = self.encoders_meta[col]
+            encode_ec(df, col, depth=meta["depth"], class_labels=meta["class_labels"], inplace=True)
+        for col in self.multihot_cols:
+            encode_multihot(df, col, inplace=True, class_labels=self.encoders_meta[col]["class_labels"])
+        return df
+
+    # ---------PUBLIC---------
+    def fit(self, paths: Union[str, List[str]]) -> "StreamingPreprocessor":
+        """
+        Fix the depth and label→index map of every label column from `paths`.
+
+        Only the label columns are read, chunk by chunk, and only the running
+        count of every distinct label is kept, so memory does not grow with the
+        number of rows.
+        """
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        self.encoders_meta = {}
+        label_cols = self._label_cols
+        if not label_cols:
+            return self
+
+        _logger.info(f"Fitting label columns {label_cols} on {len(paths)} file(s)")
+        counts = {col: Counter() for col in label_cols}
+        n_rows = 0
+        for path in paths:
+            for chunk in _iter_chunks(path, label_cols, _FIT_CHUNK_ROWS):
+                self._clean(chunk, label_cols)
+                for col in label_cols:
+                    _count_terms(chunk[col], counts[col])
+                n_rows += len(chunk)
+        if not n_rows:
+            raise ValueError(f"No rows to fit on in {paths}")
+
+        for col in self.go_cols:
+            depth, class_labels = fit_go_term_counts(counts[col], coverage_target=self.go_coverage_target)
+            self.encoders_meta[col] = {"depth": depth, "class_labels": class_labels}
+        for col in self.ec_cols:
+            depth, class_labels = fit_ec_term_counts(counts[col])
+            self.encoders_meta[col] = {"depth": depth, "class_labels": class_labels}
+        for col in self.multihot_cols:
+            # what encode_multihot fits: every distinct label, sorted
+            class_labels = {label: i for i, label in enumerate(sorted(counts[col]))}
+            self.encoders_meta[col] = {"depth": None, "class_labels": class_labels}
+
+        _logger.info(f"Fitted {n_rows} rows; cleaning memo: {self.memo.stats}")
+        return self
+
+    def estimate_chunk_rows(self, path: str) -> int:
+        """Rows per chunk that keep one chunk's processing within `memory_budget_mb`."""
+        sample = next(_iter_chunks(path, self._read_cols, _SAMPLE_ROWS), None)
+        if sample is None or sample.empty:
+            return _SAMPLE_ROWS
+        raw_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        dense_bytes = sum(dim * 4 + _VECTOR_OVERHEAD_BYTES for dim in self._dense_dims())
+        row_bytes = _MEMORY_SAFETY_FACTOR * (raw_bytes + dense_bytes)
+        rows = max(1, int(self.memory_budget_mb * 2**20 // row_bytes))
+        _logger.info(f"Estimated {row_bytes / 1024:.1f} KiB per row → {rows} row(s) per chunk "
+                     f"for a {self.memory_budget_mb} MB budget")
+        return rows
+
+    def transform(self, path: str, out_dir: str) -> List[str]:
+        """
+        Process `path` chunk by chunk into `out_dir/part-XXXXX.zip` files.
+
+        A manifest records finished parts, so an interrupted run resumes with the
+        first unwritten chunk; it raises ValueError if it belongs to a different
+        source file, column set or chunk size.
+
+        Returns
+        -------
+        list[str]
+            Paths of all part files, in input order.
+        """
+        if self.encoders_meta is None:
+            raise ValueError("StreamingPreprocessor must be fitted before transform()")
+        os.makedirs(out_dir, exist_ok=True)
+        chunk_rows = self.chunk_rows or self.estimate_chunk_rows(path)
+
+        manifest_path = os.path.join(out_dir, PIPELINE_MANIFEST_FILE_NAME)
+        manifest = {"source": os.path.abspath(path), "columns": self._read_cols,
+                    "chunk_rows": chunk_rows, "parts": [], "complete": False}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                found = json.load(f)
+            expected = {k: manifest[k] for k in ("source", "columns", "chunk_rows")}
+            if {k: found.get(k) for k in expected} != expected:
+                raise ValueError(f"Manifest at {manifest_path} was written for a different run: "
+                                 f"expected {expected}, found { {k: found.get(k) for k in expected} }")
+            manifest = found
+
+        metadata = {col: meta["class_labels"] for col, meta in self.encoders_meta.items()}
+        parts = []
+        _logger.info(f"Streaming {path} in chunks of {chunk_rows} rows to {out_dir}")
+        for i, chunk in enumerate(_iter_chunks(path, self._read_cols, chunk_rows)):
+            part = PART_FILE_TEMPLATE.format(i)
+            part_path = os.path.join(out_dir, part)
+            parts.append(part_path)
+            if part in manifest["parts"] and os.path.exists(part_path):
+                _logger.info(f"{part} already exists; skipping")
+                continue
+            _logger.info(f"Processing chunk {i} ({len(chunk)} rows)")
+            save_df(self._process(chunk), part_path, metadata=metadata)
+            manifest["parts"].append(part)
+            util.write_manifest(manifest_path, manifest)
+            del chunk
+
+        manifest["complete"] = True
+        util.write_manifest(manifest_path, manifest)
+        _logger.info(f"Finished streaming {path}: {len(parts)} part(s) in {out_dir}")
+        return parts
+
+    def fit_transform(self, path: str, out_dir: str) -> List[str]:
+        """`fit(path)` followed by `transform(path, out_dir)`."""
+        return self.fit(path).transform(path, out_dir)
+
+
+def load_streamed_df(out_dir: str) -> pd.DataFrame:
+    """
+    Load and concatenate the parts written by `StreamingPreprocessor.transform`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If `out_dir` has no pipeline manifest.
+    """
+    manifest_path = os.path.join(out_dir, PIPELINE_MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No pipeline manifest found at {manifest_path}")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not manifest.get("complete"):
+        _logger.warning(f"{out_dir} holds an incomplete run ({len(manifest['parts'])} part(s))")
+
+    frames = [load_df(os.path.join(out_dir, part)) for part in manifest["parts"]]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df.attrs.update(frames[0].attrs)
+    return df
+
+
+__all__ = [
+    "StreamingPreprocessor",
+    "load_streamed_df"
+]
+
+if __name__ == "__main__":
+    pass
@@ -1,8 +1,9 @@
 import re
 import os
+import json
 import warnings
 import functools
-from typing import Any, Type
+from typing import Any, Dict, Type
 
 def files_from(dir_path: str, pattern: re.Pattern = None):
     pattern = pattern or re.compile(r".*")
@@ -28,3 +29,12 @@ def suppress_warnings(*warning_types: Type[Warning]):
                 return func(*args, **kwargs)
         return wrapper
     return decorator
+
+def write_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    """Atomically replace the JSON manifest at `path` (write to a temp file, then rename)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,304 @@
+"""
+Throughput benchmark of the cleaning stage (`clean_col`) on synthetic UniProt annotation text.
+
+Every supported column has a generator that mimics the UniProt REST TSV format,
+including PubMed/ECO evidence braces and inline `(PubMed:...)` references, with a
+per-column share of repeated cells (GO terms, EC numbers and cofactors repeat far
+more than free text). `--length-scales` multiplies the number of items/words per
+cell to expose patterns whose cost grows faster than the input.
+
+Every column × engine × length scale runs in a fresh subprocess (so peak RSS
+is per scenario, and Arrow buffers are counted too) and reports:
+
+- rows/s            cells cleaned per second
+- distinct/s        distinct cells per second (what factorized cleaning pays for)
+- MB/s              input text per second
+- peak_rss_mb       peak resident memory of the scenario process
+- rss_growth_mb     peak RSS minus RSS after imports and warm-up
+- matches_python    whether the engine's output equals engine="python"
+
+Example:
+
+    python benchmarks/cleaning_benchmark.py --rows 50000 --engines python vectorized \\
+        --length-scales 1 8 --out cleaning.csv
+    # later, after editing AVAILABLE_EXTRACTION_PATTERNS:
+    python benchmarks/cleaning_benchmark.py --rows 50000 --compare cleaning.csv --tolerance 0.2
+"""
+# builtins:
+import argparse
+import itertools
+import os
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List
+
+# third-party:
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# *-----------------------------------------------*
+#                      GLOBALS
+# *-----------------------------------------------*
+
+WORDS = ("protein kinase domain binding activity catalyzes the transfer of phosphate group "
+         "from ATP to serine threonine residues substrate required for cell cycle progression "
+         "regulates transcription DNA repair membrane transport hydrolysis zinc-dependent "
+         "alpha/beta fold homodimer mitochondrial N-terminal C-terminal").split()
+UNICODE_WORDS = ["α-helix", "β-strand", "Ca²⁺", "naïve", "5′-end"]
+GO_TERMS = [f"{' '.join(random.Random(i).sample(WORDS, 3))} [GO:{random.Random(i).randrange(10**7):07d}]"
+            for i in range(400)]
+COFACTORS = [("Mg(2+)", 18420), ("Mn(2+)", 29035), ("Zn(2+)", 29105), ("FAD", 57692), ("heme b", 60344),
+             ("[4Fe-4S] cluster", 49883), ("pyridoxal 5'-phosphate", 597326), ("Ca(2+)", 29108)]
+PATHWAYS = ["Amino-acid biosynthesis; L-lysine biosynthesis via DAP pathway",
+            "Carbohydrate degradation; glycolysis; pyruvate from D-glyceraldehyde 3-phosphate",
+            "Cofactor biosynthesis; NAD(+) biosynthesis",
+            "Lipid metabolism; fatty acid beta-oxidation",
+            "Purine metabolism; IMP biosynthesis via de novo pathway"]
+FAMILIES = ["Protein kinase superfamily", "Ser/Thr protein kinase family", "ABC transporter superfamily",
+            "Class-I aminoacyl-tRNA synthetase family", "Glycosyl hydrolase 5 (cellulase A) family",
+            "Short-chain dehydrogenases/reductases (SDR) family"]
+
+# share of cells copied from an earlier cell of the same column (realistic-ish for UniProt)
+DUPLICATE_RATES = {
+    "Domain [FT]": 0.15, "Domain [CC]": 0.40, "Gene Ontology (molecular function)": 0.60,
+    "Gene Ontology (biological process)": 0.55, "Function [CC]": 0.30, "Catalytic activity": 0.60,
+    "EC number": 0.85, "Pathway": 0.75, "Rhea ID": 0.60, "Cofactor": 0.85, "Protein families": 0.80,
+}
+MISSING_RATE = 0.25
+ENGINES = ("python", "vectorized") # mirrors M2F.cleaning_utils.CLEANING_ENGINES
+_WARMUP_ROWS = 200
+
+# *-----------------------------------------------*
+#                SYNTHETIC COLUMNS
+# *-----------------------------------------------*
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(UNICODE_WORDS) if rng.random() < 0.01 else rng.choice(WORDS) for _ in range(n))
+
+
+def _evidence(rng: random.Random) -> str:
+    """Trailing evidence: PubMed braces, inline refs, non-PubMed braces or nothing."""
+    roll = rng.random()
+    if roll < 0.35:
+        refs = ", ".join(f"ECO:0000{rng.choice(['269', '303', '250'])}|PubMed:{rng.randrange(10**8)}"
+                         for _ in range(rng.randint(1, 4)))
+        return f" {{{refs}}}"
+    if roll < 0.55:
+        return " (" + ", ".join(f"PubMed:{rng.randrange(10**8)}" for _ in range(rng.randint(1, 3))) + ")"
+    if roll < 0.75:
+        return f" {{ECO:0000255|HAMAP-Rule:MF_{rng.randrange(10**5):05d}}}"
+    return ""
+
+
+def _domain_ft(rng: random.Random, k: int) -> str:
+    spans = []
+    for _ in range(k):
+        start = rng.randint(1, 800)
+        spans.append(f'DOMAIN {start}..{start + rng.randint(40, 300)}; /note="{_words(rng, 2)}"; '
+                     f'/evidence="ECO:0000259|PROSITE:PS{rng.randrange(10**5):05d}"')
+    return "; ".join(spans)
+
+
+def _domain_cc(rng: random.Random, k: int) -> str:
+    return " ".join(f"DOMAIN: The {_words(rng, rng.randint(6, 25))}.{_evidence(rng)}" for _ in range(k))
+
+
+def _go(rng: random.Random, k: int) -> str:
+    return "; ".join(rng.sample(GO_TERMS, min(k * 2, len(GO_TERMS))))
+
+
+def _function_cc(rng: random.Random, k: int) -> str:
+    sentences = " ".join(f"{_words(rng, rng.randint(8, 30)).capitalize()}{_evidence(rng)}."
+                         for _ in range(k))
+    return f"FUNCTION: {sentences}"
+
+
+def _ec(rng: random.Random, k: int) -> str:
+    return "; ".join(f"{rng.randint(1, 7)}.{rng.randint(1, 20)}.{rng.choice([str(rng.randint(1, 30)), '-'])}."
+                     f"{rng.choice([str(rng.randint(1, 200)), '-', 'n' + str(rng.randint(1, 9))])}"
+                     for _ in range(max(1, k // 2)))
+
+
+def _catalytic(rng: random.Random, k: int) -> str:
+    return " ".join(
+        f"CATALYTIC ACTIVITY: Reaction=L-seryl-[protein] + ATP = O-phospho-L-seryl-[protein] + ADP + H(+); "
+        f"Xref=Rhea:RHEA:{rng.randrange(10**5)}, ChEBI:CHEBI:{rng.randrange(10**5)}; "
+        f"EC={rng.randint(1, 7)}.{rng.randint(1, 20)}.{rng.randint(1, 30)}.{rng.randint(1, 200)};"
+        f" Evidence={{ECO:0000269|PubMed:{rng.randrange(10**8)}}}; PhysiologicalDirection=left-to-right;"
+        for _ in range(k)
+    )
+
+
+def _pathway(rng: random.Random, k: int) -> str:
+    return "; ".join(f"PATHWAY: {rng.choice(PATHWAYS)}: step {rng.randint(1, 3)}/{rng.randint(3, 9)}.{_evidence(rng)}"
+                     for _ in range(k))
+
+
+def _rhea(rng: random.Random, k: int) -> str:
+    return " ".join(f"RHEA:{rng.randrange(10**5)}" for _ in range(k * 2))
+
+
+def _cofactor(rng: random.Random, k: int) -> str:
+    parts = [f"Name={name}; Xref=ChEBI:CHEBI:{chebi}; Evidence={{ECO:0000250|UniProtKB:P{rng.randrange(10**5):05d}}};"
+             for name, chebi in rng.sample(COFACTORS, min(k, len(COFACTORS)))]
+    return f"COFACTOR: {' '.join(parts)} Note=Binds {rng.randint(1, 4)} {_words(rng, 3)}.{_evidence(rng)};"
+
+
+def _families(rng: random.Random, k: int) -> str:
+    return ", ".join(rng.choice(FAMILIES) for _ in range(k))
+
+
+COLUMN_GENERATORS: Dict[str, Callable[[random.Random, int], str]] = {
+    "Domain [FT]": _domain_ft,
+    "Domain [CC]": _domain_cc,
+    "Gene Ontology (molecular function)": _go,
+    "Gene Ontology (biological process)": _go,
+    "Function [CC]": _function_cc,
+    "Catalytic activity": _catalytic,
+    "EC number": _ec,
+    "Pathway": _pathway,
+    "Rhea ID": _rhea,
+    "Cofactor": _cofactor,
+    "Protein families": _families,
+}
+
+
+def synthetic_column(col_name: str, n: int, seed: int = 0, length_scale: int = 1,
+                     duplicate_rate: float = None, missing_rate: float = MISSING_RATE) -> pd.Series:
+    """`n` cells of `col_name`; each cell has ~`length_scale`× the usual number of items."""
+    rng = random.Random(f"{seed}-{col_name}-{length_scale}")
+    generate = COLUMN_GENERATORS[col_name]
+    duplicate_rate = DUPLICATE_RATES[col_name] if duplicate_rate is None else duplicate_rate
+    cells: List[Any] = []
+    seen: List[str] = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < missing_rate:
+            cells.append(np.nan)
+        elif seen and roll < missing_rate + (1 - missing_rate) * duplicate_rate:
+            cells.append(rng.choice(seen))
+        else:
+            cell = generate(rng, rng.randint(1, 3) * length_scale)
+            seen.append(cell)
+            cells.append(cell)
+    return pd.Series(cells, dtype=object, name=col_name)
+
+# *-----------------------------------------------*
+#                      UTILS
+# *-----------------------------------------------*
+
+def _rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def _run_scenario(values: pd.Series, col_name: str, engine: str, repeat: int) -> Dict[str, Any]:
+    """Clean one column in this (fresh) process; returns the fastest time, memory and the output."""
+    from M2F.cleaning_utils import clean_col
+
+    # warm-up: regex compilation and Arrow kernel loading are not part of the measurement
+    clean_col(values.head(_WARMUP_ROWS).to_frame(), col_name, inplace=True, engine=engine)
+    rss_before = _rss_mb()
+    seconds = []
+    for _ in range(repeat):
+        df = values.to_frame()
+        started = time.perf_counter()
+        clean_col(df, col_name, inplace=True, engine=engine)
+        seconds.append(time.perf_counter() - started)
+    peak = _rss_mb()
+    return {"seconds": min(seconds), "peak_rss_mb": peak, "rss_growth_mb": peak - rss_before,
+            "cleaned": df[col_name]}
+
+# *-----------------------------------------------*
+#                      MAIN
+# *-----------------------------------------------*
+
+def run_benchmark(args: argparse.Namespace) -> pd.DataFrame:
+    results = []
+    for col_name, scale in itertools.product(args.columns, args.length_scales):
+        values = synthetic_column(col_name, args.rows, seed=args.seed, length_scale=scale)
+        text = values[values.map(lambda v: isinstance(v, str))]
+        n_distinct = text.nunique()
+        mb = text.str.len().sum() / 2**20
+        reference = None
+        # engine="python" runs first so the other engines are checked against it
+        for engine in sorted(set(args.engines) | {"python"}, key=lambda e: e != "python"):
+            print(f"Running {col_name!r} × {engine} × length {scale} ...", file=sys.stderr)
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                measured = pool.submit(_run_scenario, values, col_name, engine, args.repeat).result()
+            if engine == "python":
+                reference = measured["cleaned"]
+                if engine not in args.engines:
+                    continue
+            results.append({
+                "column": col_name,
+                "engine": engine,
+                "length_scale": scale,
+                "rows": len(values),
+                "distinct": n_distinct,
+                "mean_cell_chars": round(text.str.len().mean(), 1),
+                "seconds": round(measured["seconds"], 4),
+                "rows/s": round(len(values) / measured["seconds"], 1),
+                "distinct/s": round(n_distinct / measured["seconds"], 1),
+                "MB/s": round(mb / measured["seconds"], 2),
+                "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+                "rss_growth_mb": round(measured["rss_growth_mb"], 1),
+                "matches_python": bool(measured["cleaned"].equals(reference)),
+            })
+    return pd.DataFrame(results)
+
+
+def compare(results: pd.DataFrame, baseline_path: str, tolerance: float) -> pd.DataFrame:
+    """Join with a previous run; `slowdown` > 1 + tolerance marks a regression."""
+    baseline = pd.read_csv(baseline_path) if not baseline_path.endswith(".json") else pd.read_json(baseline_path)
+    keys = ["column", "engine", "length_scale"]
+    merged = results.merge(baseline[keys + ["MB/s"]], on=keys, how="left", suffixes=("", "_baseline"))
+    merged["slowdown"] = (merged["MB/s_baseline"] / merged["MB/s"]).round(3)
+    merged["regression"] = merged["slowdown"] > 1 + tolerance
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark clean_col on synthetic UniProt annotation text")
+    parser.add_argument("--rows", type=int, default=20_000, help="cells per column")
+    parser.add_argument("--columns", nargs="+", choices=sorted(COLUMN_GENERATORS), default=list(COLUMN_GENERATORS))
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=["python", "vectorized"])
+    parser.add_argument("--length-scales", type=int, nargs="+", default=[1, 8],
+                        help="multipliers of the items/words per cell (long inputs expose backtracking)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="baseline .csv/.json from a previous run; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed MB/s slowdown vs. the baseline")
+    parser.add_argument("--out", help="write the results to this .csv or .json file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    if args.compare:
+        results = compare(results, args.compare, args.tolerance)
+    print(results.to_string(index=False))
+    if args.out:
+        if args.out.endswith(".json"):
+            results.to_json(args.out, orient="records", indent=2)
+        else:
+            results.to_csv(args.out, index=False)
+        print(f"Results written to {args.out}", file=sys.stderr)
+
+    failed = []
+    if args.compare and results["regression"].any():
+        failed.append(f"{int(results['regression'].sum())} regression(s) beyond {args.tolerance:.0%}")
+    if not results["matches_python"].all():
+        failed.append("engine outputs differ from engine='python'")
+    if failed:
+        print("; ".join(failed), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
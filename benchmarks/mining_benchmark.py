@@ -0,0 +1,189 @@
+"""
+Throughput benchmark of the UniProt mining stage against the offline mock server.
+
+Every combination of `--request-sizes`, `--rps`, `--workers` and `--profiles`
+runs in a fresh subprocess (so peak RSS is per scenario) against a
+`MockUniProtServer`, and reports:
+
+- req/s            HTTP requests served per second (incl. retries)
+- rows/s           rows returned to the caller per second
+- amplification    HTTP requests / requests a fault-free run needs
+- peak_rss_mb      peak resident memory of the scenario process
+- rss_growth_mb    peak RSS minus RSS after imports
+
+Example:
+
+    python benchmarks/mining_benchmark.py --ids 20000 --fields accession,length,sequence \\
+        --request-sizes 100 200 --rps 10 50 --workers 1 4 --profiles clean throttled --out mining.csv
+"""
+# builtins:
+import argparse
+import itertools
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from multiprocessing import get_context
+from typing import Any, Dict, List
+
+# third-party:
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_uniprot_server import MockUniProtServer, synthetic_accessions
+
+# *-----------------------------------------------*
+#                      GLOBALS
+# *-----------------------------------------------*
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "clean":     {},
+    "slow":      {"latency": 0.2, "jitter": 0.5},
+    "flaky":     {"error_rate": 0.05, "retry_after": None},
+    "throttled": {"throttle_rps": 20, "retry_after": 1},
+    "bursty":    {"burst_every": 3.3, "burst_length": 0.5, "retry_after": 1}, # not a multiple of the back-offs
+    "large":     {"sequence_length": 3000, "text_bytes": 2000},
+}
+THROTTLING_PROFILES = {"throttled", "bursty"} # must see 429s to measure the back-off path
+TARGETS = {"fetch", "parquet", "batches"}
+_IDMAPPING_PAGE_SIZE = 500 # mirrors M2F.mining_utils._idmapping_request
+
+# *-----------------------------------------------*
+#                      UTILS
+# *-----------------------------------------------*
+
+def _rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def _run_scenario(url: str, scenario: Dict[str, Any], ids: List[str], fields: List[str]) -> Dict[str, Any]:
+    """Run one retrieval in this (fresh) process; returns timing, rows and memory."""
+    import logging
+    from M2F.mining_utils import (UniProtClient, fetch_uniprotkb_fields,
+                                  fetch_uniprotkb_fields_to_parquet, fetch_save_uniprotkb_batches)
+    logging.basicConfig(level=scenario["log_level"])
+
+    kwargs = dict(rps=scenario["rps"], max_workers=scenario["workers"],
+                  engine=scenario["engine"], adaptive=scenario["adaptive"])
+    rss_before = _rss_mb()
+    with tempfile.TemporaryDirectory() as tmp, \
+         UniProtClient(base_url=url, pool_maxsize=scenario["workers"]) as client:
+        started = time.perf_counter()
+        if scenario["target"] == "fetch":
+            rows = len(fetch_uniprotkb_fields(ids, fields, request_size=scenario["request_size"],
+                                              client=client, **kwargs))
+        elif scenario["target"] == "parquet":
+            rows = fetch_uniprotkb_fields_to_parquet(ids, fields, os.path.join(tmp, "out.parquet"),
+                                                     request_size=scenario["request_size"],
+                                                     client=client, **kwargs)
+        else:
+            out = fetch_save_uniprotkb_batches(ids, fields, batch_size=scenario["batch_size"],
+                                               single_api_request_size=scenario["request_size"],
+                                               save_to_dir=tmp, client=client,
+                                               streaming=scenario["streaming"], **kwargs)
+            rows = sum(len(pd.read_parquet(os.path.join(out, f)))
+                       for f in os.listdir(out) if f.endswith(".parquet"))
+        seconds = time.perf_counter() - started
+    peak = _rss_mb()
+    return {"seconds": seconds, "rows": rows, "peak_rss_mb": peak, "rss_growth_mb": peak - rss_before}
+
+
+def _baseline_requests(n_ids: int, request_size: int, engine: str, batch_size: int) -> int:
+    """HTTP requests a fault-free run needs."""
+    chunks = []
+    for start in range(0, n_ids, batch_size):
+        batch = min(batch_size, n_ids - start)
+        chunks += [request_size] * (batch // request_size) + ([batch % request_size] if batch % request_size else [])
+    if engine == "idmapping":
+        # submit + status + result pages
+        return sum(2 + ceil(c / _IDMAPPING_PAGE_SIZE) for c in chunks)
+    return len(chunks)
+
+# *-----------------------------------------------*
+#                      MAIN
+# *-----------------------------------------------*
+
+def run_benchmark(args: argparse.Namespace) -> pd.DataFrame:
+    ids = synthetic_accessions(args.ids, seed=args.seed, invalid_fraction=args.invalid_fraction)
+    fields = args.fields.split(",")
+    results = []
+
+    with MockUniProtServer(latency=args.latency, seed=args.seed) as server:
+        defaults = {k: getattr(server, k) for k in ("latency", "jitter", "error_rate", "throttle_rps",
+                                                     "burst_every", "burst_length", "retry_after",
+                                                     "sequence_length", "text_bytes")}
+        grid = itertools.product(args.profiles, args.request_sizes, args.rps, args.workers)
+        for profile, request_size, rps, workers in grid:
+            server.configure(**{**defaults, **PROFILES[profile]}, seed=args.seed)
+            server.reset_stats()
+            scenario = {"profile": profile, "target": args.target, "engine": args.engine,
+                        "request_size": request_size, "rps": rps, "workers": workers,
+                        "adaptive": args.adaptive, "batch_size": args.batch_size,
+                        "streaming": args.streaming, "log_level": args.log_level}
+            print(f"Running {scenario} ...", file=sys.stderr)
+
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                measured = pool.submit(_run_scenario, server.url, scenario, ids, fields).result()
+
+            batch_size = args.batch_size if args.target == "batches" else args.ids
+            requests_sent = server.stats["requests"]
+            if profile in THROTTLING_PROFILES and not server.stats["status_429"]:
+                print(f"WARNING: profile '{profile}' throttled no request, so the back-off path "
+                      "was not exercised; use more --ids or a lower burst period", file=sys.stderr)
+            results.append({
+                **{k: scenario[k] for k in ("profile", "target", "engine", "request_size", "rps", "workers", "adaptive")},
+                "seconds": round(measured["seconds"], 3),
+                "requests": requests_sent,
+                "req/s": round(requests_sent / measured["seconds"], 2),
+                "rows": measured["rows"],
+                "rows/s": round(measured["rows"] / measured["seconds"], 1),
+                "amplification": round(requests_sent / _baseline_requests(args.ids, request_size,
+                                                                          args.engine, batch_size), 3),
+                "throttled": server.stats["status_429"],
+                "server_errors": server.stats["status_503"],
+                "MB_served": round(server.stats["bytes"] / 2**20, 2),
+                "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+                "rss_growth_mb": round(measured["rss_growth_mb"], 1),
+            })
+
+    return pd.DataFrame(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark UniProt mining against a local mock server")
+    parser.add_argument("--ids", type=int, default=5000, help="number of synthetic accessions")
+    parser.add_argument("--fields", default="accession,length,sequence")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="fetch",
+                        help="fetch_uniprotkb_fields, fetch_uniprotkb_fields_to_parquet or fetch_save_uniprotkb_batches")
+    parser.add_argument("--engine", choices=["search", "idmapping"], default="search")
+    parser.add_argument("--request-sizes", type=int, nargs="+", default=[100])
+    parser.add_argument("--rps", type=float, nargs="+", default=[10.0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=["clean"])
+    parser.add_argument("--adaptive", action="store_true", help="enable adaptive rate control")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="batch size for --target batches")
+    parser.add_argument("--streaming", action="store_true", help="streaming mode for --target batches")
+    parser.add_argument("--latency", type=float, default=0.02, help="base server latency in seconds")
+    parser.add_argument("--invalid-fraction", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="ERROR")
+    parser.add_argument("--out", help="write the results to this .csv or .json file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print(results.to_string(index=False))
+    if args.out:
+        if args.out.endswith(".json"):
+            results.to_json(args.out, orient="records", indent=2)
+        else:
+            results.to_csv(args.out, index=False)
+        print(f"Results written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
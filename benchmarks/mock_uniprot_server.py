@@ -0,0 +1,357 @@
+"""
+Offline stand-in for the parts of rest.uniprot.org used by M2F.mining_utils.
+
+Serves deterministic synthetic TSV for `uniprotkb/search` and for the
+ID-mapping endpoints (`idmapping/run`, `idmapping/status/{id}`,
+`idmapping/uniprotkb/results/{id}` with `Link: rel="next"` cursors), honors
+`Accept-Encoding: gzip`, and can inject latency, random 5xx errors, 429
+throttling (with `Retry-After`) and invalid accessions.
+
+Usage as a library:
+
+    with MockUniProtServer(latency=0.05, error_rate=0.01) as server:
+        client = UniProtClient(base_url=server.url)
+        ...
+        print(server.stats)
+
+or standalone: `python benchmarks/mock_uniprot_server.py --port 8080 --latency 0.05`.
+"""
+# builtins:
+import argparse
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, urlencode
+
+# *-----------------------------------------------*
+#                      GLOBALS
+# *-----------------------------------------------*
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+FIELD_LABELS = {
+    "accession": "Entry",
+    "length": "Length",
+    "sequence": "Sequence",
+    "ft_domain": "Domain [FT]",
+    "cc_domain": "Domain [CC]",
+    "protein_families": "Protein families",
+    "go_f": "Gene Ontology (molecular function)",
+    "go_p": "Gene Ontology (biological process)",
+    "cc_function": "Function [CC]",
+    "cc_catalytic_activity": "Catalytic activity",
+    "ec": "EC number",
+    "cc_pathway": "Pathway",
+    "rhea": "Rhea ID",
+    "cc_cofactor": "Cofactor",
+}
+_FIELD_RE = re.compile(r"^[a-z0-9_]+$")
+
+# *-----------------------------------------------*
+#                   SYNTHETIC DATA
+# *-----------------------------------------------*
+
+def _rng(accession: str, field: str) -> random.Random:
+    return random.Random(zlib.crc32(f"{accession}|{field}".encode()))
+
+
+def synthetic_value(accession: str, field: str, sequence_length: int = 300, text_bytes: int = 200) -> str:
+    """Deterministic value of `field` for `accession` (empty for ~10% of free-text cells)."""
+    rng = _rng(accession, field)
+    length = max(1, int(rng.gauss(sequence_length, sequence_length / 4)))
+    if field == "accession":
+        return accession
+    if field == "length":
+        return str(length)
+    if field == "sequence":
+        return "".join(rng.choices(AMINO_ACIDS, k=length))
+    if field in ("go_f", "go_p"):
+        return "; ".join(f"term {rng.randrange(10_000)} [GO:{rng.randrange(10**7):07d}]"
+                         for _ in range(rng.randint(1, 5)))
+    if field == "ec":
+        return "; ".join(f"{rng.randint(1, 7)}.{rng.randint(1, 20)}.{rng.randint(1, 30)}.{rng.randint(1, 200)}"
+                         for _ in range(rng.randint(1, 2)))
+    if rng.random() < 0.1:
+        return ""
+    words = []
+    while sum(len(w) + 1 for w in words) < text_bytes:
+        words.append("".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 10))))
+    return f"{field.upper()}: " + " ".join(words) + f" (PubMed:{rng.randrange(10**8)})."
+
+
+def synthetic_accessions(n: int, seed: int = 0, invalid_fraction: float = 0.0) -> List[str]:
+    """`n` unique UniProt-like accessions; `invalid_fraction` of them start with 'BAD'."""
+    rng = random.Random(seed)
+    ids = [f"{'BAD' if rng.random() < invalid_fraction else 'Q'}{i:07d}" for i in range(n)]
+    rng.shuffle(ids)
+    return ids
+
+# *-----------------------------------------------*
+#                      SERVER
+# *-----------------------------------------------*
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients closing pooled keep-alive connections are expected
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class MockUniProtServer:
+    """
+    Threaded local HTTP server imitating the UniProt REST API.
+
+    Parameters
+    ----------
+    host, port : str, int
+        Bind address (port 0 picks a free port).
+    latency : float
+        Mean seconds added to every response (exponentially jittered by `jitter`).
+    jitter : float
+        Fraction of `latency` drawn as exponential noise.
+    error_rate : float
+        Probability that a request fails with 503.
+    throttle_rps : float or None
+        Requests per second (sliding one-second window) above which 429 is returned.
+    burst_every, burst_length : float or None
+        Every `burst_every` seconds, answer everything with 429 for `burst_length` seconds.
+        The burst clock starts at the first request after `start()` / `reset_stats()`.
+    retry_after : float or None
+        `Retry-After` seconds sent with 429/503 responses (omitted if None).
+    sequence_length, text_bytes : int
+        Mean payload size of the `sequence` field and of free-text fields.
+    invalid_prefix : str
+        Accessions starting with it make search requests fail with 400.
+    missing_rate : float
+        Probability that a valid accession is silently absent from the results.
+    seed : int
+        Seed of the error/latency generator.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rps: Optional[float] = None,
+        burst_every: Optional[float] = None,
+        burst_length: Optional[float] = None,
+        retry_after: Optional[float] = 1.0,
+        sequence_length: int = 300,
+        text_bytes: int = 200,
+        invalid_prefix: str = "BAD",
+        missing_rate: float = 0.0,
+        seed: int = 0
+    ):
+        self.host = host
+        self.port = port
+        self.configure(latency=latency, jitter=jitter, error_rate=error_rate,
+                       throttle_rps=throttle_rps, burst_every=burst_every, burst_length=burst_length,
+                       retry_after=retry_after, sequence_length=sequence_length, text_bytes=text_bytes,
+                       invalid_prefix=invalid_prefix, missing_rate=missing_rate, seed=seed)
+        self._jobs: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._recent: deque = deque()
+        self._first_request: Optional[float] = None
+        self._httpd: Optional[_QuietHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.reset_stats()
+
+    # ---------PUBLIC---------
+    def configure(self, **settings) -> None:
+        """Change fault-injection / payload settings (see the class parameters)."""
+        for name, value in settings.items():
+            if name == "seed":
+                self._random = random.Random(value)
+            setattr(self, name, value)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = Counter()
+            self._first_request = None
+            self._recent = deque()
+
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("The server is not running; call start() first")
+        return f"http://{self.host}:{self._httpd.server_port}"
+
+    def start(self) -> "MockUniProtServer":
+        self._httpd = _QuietHTTPServer((self.host, self.port), self._make_handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # ---------PRIVATE-----------
+    def _fault(self) -> Optional[int]:
+        """Status code to fail the current request with, if any; also records it."""
+        with self._lock:
+            now = time.monotonic()
+            self.stats["requests"] += 1
+            self._recent.append(now)
+            if self._first_request is None:
+                # anchor bursts to the client's first request, not to server start-up
+                self._first_request = now
+            while self._recent and self._recent[0] <= now - 1.0:
+                self._recent.popleft()
+            in_burst = (self.burst_every and self.burst_length
+                        and (now - self._first_request) % self.burst_every < self.burst_length)
+            if in_burst or (self.throttle_rps is not None and len(self._recent) > self.throttle_rps):
+                return 429
+            if self._random.random() < self.error_rate:
+                return 503
+            return None
+
+    def _delay(self) -> None:
+        if self.latency > 0:
+            with self._lock:
+                noise = self._random.expovariate(1.0) * self.jitter if self.jitter else 0.0
+            time.sleep(self.latency * (1.0 + noise))
+
+    def _rows(self, ids: List[str], fields: List[str], with_from: bool = False) -> str:
+        header = (["From"] if with_from else []) + [FIELD_LABELS.get(f, f) for f in fields]
+        lines = ["\t".join(header)]
+        for uid in ids:
+            if zlib.crc32(uid.encode()) % 10_000 < self.missing_rate * 10_000:
+                continue
+            values = [synthetic_value(uid, f, self.sequence_length, self.text_bytes) for f in fields]
+            lines.append("\t".join(([uid] if with_from else []) + values))
+        with self._lock:
+            self.stats["rows"] += len(lines) - 1
+        return "\n".join(lines) + "\n"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code: int, body: str = "", headers: Optional[Dict[str, str]] = None) -> None:
+                payload = body.encode()
+                self.send_response(code)
+                if payload and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    payload = gzip.compress(payload, compresslevel=1)
+                    self.send_header("Content-Encoding", "gzip")
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with server._lock:
+                    server.stats[f"status_{code}"] += 1
+                    server.stats["bytes"] += len(payload)
+
+            def _fail(self, code: int) -> None:
+                headers = {}
+                if server.retry_after is not None:
+                    headers["Retry-After"] = f"{server.retry_after:g}"
+                self._send(code, f"Error {code}", headers)
+
+            def _fields(self, query: Dict[str, List[str]]) -> Optional[List[str]]:
+                fields = query.get("fields", ["accession"])[0].split(",")
+                return fields if all(_FIELD_RE.match(f) for f in fields) else None
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                if urlparse(self.path).path.rstrip("/") != "/idmapping/run" or "ids" not in form:
+                    return self._send(404, "Not found")
+                if (code := server._fault()) is not None:
+                    return self._fail(code)
+                server._delay()
+                with server._lock:
+                    job_id = f"job{len(server._jobs)}"
+                    server._jobs[job_id] = [uid for uid in form["ids"][0].split(",")
+                                            if not uid.startswith(server.invalid_prefix)]
+                self._send(200, json.dumps({"jobId": job_id}), {"Content-Type": "application/json"})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if (code := server._fault()) is not None:
+                    return self._fail(code)
+                server._delay()
+                fields = self._fields(query)
+
+                if url.path.startswith("/idmapping/status/"):
+                    job_id = url.path.rsplit("/", 1)[1]
+                    if job_id not in server._jobs:
+                        return self._send(404, "Unknown job")
+                    return self._send(303, "", {"Location": f"/idmapping/uniprotkb/results/{job_id}"})
+
+                if url.path.startswith("/idmapping/uniprotkb/results/"):
+                    job_id = url.path.rsplit("/", 1)[1]
+                    if job_id not in server._jobs or fields is None:
+                        return self._send(400, "Bad request")
+                    size   = int(query.get("size", ["500"])[0])
+                    cursor = int(query.get("cursor", ["0"])[0])
+                    ids    = server._jobs[job_id]
+                    headers = {}
+                    if cursor + size < len(ids):
+                        nxt = urlencode({"format": "tsv", "fields": ",".join(fields),
+                                         "size": size, "cursor": cursor + size})
+                        headers["Link"] = f'<{server.url}{url.path}?{nxt}>; rel="next"'
+                    return self._send(200, server._rows(ids[cursor:cursor + size], fields, with_from=True), headers)
+
+                if url.path.rstrip("/") == "/uniprotkb/search":
+                    if fields is None or "query" not in query:
+                        return self._send(400, "Bad request")
+                    ids = [term.split(":", 1)[-1] for term in query["query"][0].split(" OR ")]
+                    if any(uid.startswith(server.invalid_prefix) for uid in ids):
+                        return self._send(400, "Invalid accession")
+                    return self._send(200, server._rows(ids, fields))
+
+                self._send(404, "Not found")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for rest.uniprot.org")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rps", type=float, default=None)
+    parser.add_argument("--burst-every", type=float, default=None)
+    parser.add_argument("--burst-length", type=float, default=None)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--sequence-length", type=int, default=300)
+    parser.add_argument("--text-bytes", type=int, default=200)
+    args = parser.parse_args()
+
+    with MockUniProtServer(**vars(args)) as srv:
+        print(f"Mock UniProt API listening on {srv.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
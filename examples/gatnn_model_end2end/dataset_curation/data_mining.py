@@ -16,8 +16,10 @@ assert logs_dir, "LOGS_DIR env var was not set!"
 
 configure_logging(logs_dir)
 
-accession_nums = extract_all_accessions_from_dir(gene_fam_files_dir, 
+unirefs, _ = extract_all_accessions_from_dir(gene_fam_files_dir,
                                              pattern=re.compile(r".*_genefamilies\.tsv$"))
+# sorted, so that a pre-empted job resumes with the same batches
+accession_nums = sorted(unirefs)
 
 
 out = os.path.join(output_dir, job_name + "_output_dir")
@@ -33,6 +35,7 @@ fetch_save_uniprotkb_batches(
     single_api_request_size=100,
     rps=10,
     save_to_dir=out,
+    resume=True,
 )
 
 print(f"Mined data is available at {out}")
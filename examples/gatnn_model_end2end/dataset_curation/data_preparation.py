@@ -89,19 +89,28 @@ def process_df_inplace(df: pd.DataFrame, *, col_names: list, apply_norms: dict)
 
     return {"gomf_meta": gomf_meta, "gobp_meta": gobp_meta, "ec_meta": ec_meta, "cofactor_meta": cofactor_meta}
 
-files = M2F.util.files_from(raw_data)
-logger.info(f"Processing all the files from {raw_data}")
-for i, file in enumerate(files, start=1):
-    file_name = os.path.basename(file)
-    out_pth = os.path.join(out, file_name.replace(".csv", ".zip"))
+def raw_slices(raw_data: str):
+    """Yield (name, loader) pairs: one per accession-prefix partition if RAW_DATA is a
+    dataset written by fetch_save_uniprotkb_batches(output="dataset"), else one per CSV file."""
+    prefixes = M2F.uniprotkb_dataset_prefixes(raw_data)
+    if prefixes:
+        for prefix in prefixes:
+            yield f"accession_prefix={prefix}", lambda p=prefix: M2F.read_uniprotkb_dataset(raw_data, accession_prefixes=[p])
+    else:
+        for file in M2F.util.files_from(raw_data):
+            yield os.path.basename(file).replace(".csv", ""), lambda f=file: pd.read_csv(f)
+
+logger.info(f"Processing all the slices from {raw_data}")
+for i, (name, load) in enumerate(raw_slices(raw_data), start=1):
+    out_pth = os.path.join(out, name + ".zip")
     # Note: this is needed in case we rerun the job that was stopped in the middle of execution
     # so that we don't duplicate files
     if os.path.exists(out_pth):
-        logger.info(f"File number {i} ({file_name}) already exists; Skipping")
+        logger.info(f"Slice number {i} ({name}) already exists; Skipping")
         continue
-    logger.info(f"Processing file number {i}: {file_name}")
+    logger.info(f"Processing slice number {i}: {name}")
     # load
-    df = pd.read_csv(file)
+    df = load()
     # process
     meta = process_df_inplace(df, col_names=col_names, apply_norms=apply_norms)
     # save
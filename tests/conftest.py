@@ -0,0 +1,22 @@
+"""Shared fixtures: the offline UniProt stand-in from benchmarks/ and a client bound to it."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from mock_uniprot_server import MockUniProtServer
+
+from M2F.mining_utils import UniProtClient
+
+
+@pytest.fixture
+def uniprot_server():
+    with MockUniProtServer() as server:
+        yield server
+
+
+@pytest.fixture
+def uniprot_client(uniprot_server):
+    with UniProtClient(base_url=uniprot_server.url) as client:
+        yield client
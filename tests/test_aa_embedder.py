@@ -0,0 +1,246 @@
+"""AAChainEmbedder on a tiny randomly initialised ESM-2 model, against a per-sequence reference."""
+import random
+
+import numpy as np
+import pytest
+import torch
+from transformers import EsmConfig, EsmModel, EsmTokenizer
+
+import M2F.embedding_utils as embedding_utils
+from M2F.embedding_utils import AAChainEmbedder
+
+ESM_VOCAB = ["<cls>", "<pad>", "<eos>", "<unk>", "L", "A", "G", "V", "S", "E", "R", "T", "I", "D", "P", "K", "Q",
+             "N", "F", "Y", "M", "H", "W", "C", "X", "B", "U", "Z", "O", ".", "-", "<null_1>", "<mask>"]
+
+
+def tiny_esm(max_positions: int) -> EsmModel:
+    torch.manual_seed(0)
+    config = EsmConfig(vocab_size=len(ESM_VOCAB), hidden_size=32, num_hidden_layers=4, num_attention_heads=4,
+                       intermediate_size=64, max_position_embeddings=max_positions,
+                       position_embedding_type="rotary", token_dropout=True, mask_token_id=32, pad_token_id=1,
+                       emb_layer_norm_before=False)
+    return EsmModel(config)
+
+
+@pytest.fixture
+def make_embedder(tmp_path, monkeypatch):
+    """Build AAChainEmbedders around a tiny ESM-2 model instead of a downloaded checkpoint."""
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(ESM_VOCAB))
+    tokenizer = EsmTokenizer(str(vocab))
+
+    def make(max_positions: int = 130, **kwargs) -> AAChainEmbedder:
+        monkeypatch.setattr(embedding_utils.AutoModel, "from_pretrained",
+                            lambda *args, **kw: tiny_esm(max_positions))
+        monkeypatch.setattr(embedding_utils.AutoTokenizer, "from_pretrained", lambda *args, **kw: tokenizer)
+        return AAChainEmbedder(**kwargs)
+
+    return make
+
+
+def random_seqs(n: int, lo: int = 5, hi: int = 120, seed: int = 0):
+    rng = random.Random(seed)
+    return ["".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=rng.randint(lo, hi))) for _ in range(n)]
+
+
+@torch.no_grad()
+def residue_states(embedder: AAChainEmbedder, seq: str) -> torch.Tensor:
+    """States of `seq`'s residues at the representation layer: one unpadded, full forward pass."""
+    toks = embedder.tokenizer([seq], return_tensors="pt")
+    states = embedder.model(**toks, output_hidden_states=True).hidden_states[embedder.repr_idx]
+    return states[0, 1:-1] # drop BOS/EOS
+
+
+def reference(embedder: AAChainEmbedder, seqs):
+    return np.stack([residue_states(embedder, s).mean(0).numpy() for s in seqs])
+
+
+class ForwardCounter:
+    """Records the padded shape of every forward pass of `model`."""
+
+    def __init__(self, model):
+        self.shapes = []
+        model.register_forward_pre_hook(self._record, with_kwargs=True)
+
+    def _record(self, module, args, kwargs):
+        self.shapes.append(tuple(kwargs["input_ids"].shape))
+
+
+# ---------length-bucketed batching---------
+@pytest.mark.parametrize("seed", range(5))
+def test_length_batches_cover_every_index_within_budget(seed):
+    rng = random.Random(seed)
+    lengths = [rng.randint(1, 300) for _ in range(rng.randint(1, 200))]
+    batch_size, max_tokens = rng.randint(1, 40), rng.choice([None, 200, 1000, 5000])
+
+    batches = AAChainEmbedder._length_batches(lengths, batch_size, max_tokens)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    flat = [lengths[i] for batch in batches for i in batch]
+    assert flat == sorted(lengths, reverse=True)
+    for batch in batches:
+        assert len(batch) <= batch_size
+        padded = len(batch) * (lengths[batch[0]] + 2)
+        assert max_tokens is None or padded <= max_tokens or len(batch) == 1
+
+
+@pytest.mark.parametrize("max_tokens", [None, 300, 1])
+def test_bucketed_batches_keep_input_order(make_embedder, max_tokens):
+    embedder = make_embedder()
+    seqs = random_seqs(40, seed=1)
+    counter = ForwardCounter(embedder.model)
+
+    got = embedder.embed_matrix(seqs, batch_size=8, max_tokens=max_tokens)
+    shapes = counter.shapes[:]
+
+    np.testing.assert_allclose(got, reference(embedder, seqs), atol=1e-5)
+    assert len(shapes) == len(AAChainEmbedder._length_batches([len(s) for s in seqs], 8, max_tokens))
+    assert all(b <= 8 for b, _ in shapes)
+    if max_tokens is not None:
+        assert all(b * length <= max_tokens or b == 1 for b, length in shapes)
+    # similar lengths share a batch, so padding stays small
+    assert sum(b * length for b, length in shapes) < 1.2 * sum(len(s) + 2 for s in seqs)
+
+
+# ---------early exit at the representation layer---------
+@pytest.mark.parametrize("layer", [0, 1, "second_to_last", "last"])
+def test_early_exit_matches_full_pass(make_embedder, layer):
+    seqs = random_seqs(12, seed=2)
+    full = make_embedder(representation_layer=layer, early_exit=False).embed_matrix(seqs, batch_size=4)
+    embedder = make_embedder(representation_layer=layer)
+
+    np.testing.assert_allclose(embedder.embed_matrix(seqs, batch_size=4), full, atol=1e-6)
+    np.testing.assert_allclose(full, reference(embedder, seqs), atol=1e-5)
+
+
+def test_early_exit_skips_later_layers(make_embedder):
+    embedder = make_embedder(representation_layer=1)
+    calls = [0] * len(embedder.model.encoder.layer)
+    for k, layer in enumerate(embedder.model.encoder.layer):
+        layer.register_forward_hook(lambda module, args, output, k=k: calls.__setitem__(k, calls[k] + 1))
+
+    embedder.embed_matrix(random_seqs(6, seed=3), batch_size=2)
+    # hidden_states[1] is the output of the first layer
+    assert calls == [3, 0, 0, 0]
+
+
+# ---------batched pooling into one matrix---------
+def test_embed_matrix_matches_per_sequence_reference(make_embedder):
+    embedder = make_embedder()
+    seqs = random_seqs(30, lo=1, hi=128, seed=4)
+
+    got = embedder.embed_matrix(seqs, batch_size=7)
+
+    assert got.shape == (30, 32) and got.dtype == np.float32 and got.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(got, reference(embedder, seqs), atol=1e-5)
+    np.testing.assert_array_equal(np.stack(embedder.embed_sequences(seqs, batch_size=7)), got)
+
+
+def test_duplicates_are_embedded_once(make_embedder):
+    embedder = make_embedder()
+    seqs = random_seqs(5, seed=5)
+    seqs = seqs + seqs[::-1] + [seqs[2]]
+    counter = ForwardCounter(embedder.model)
+
+    got = embedder.embed_matrix(seqs, batch_size=1)
+
+    assert len(counter.shapes) == 5
+    np.testing.assert_allclose(got, reference(embedder, seqs), atol=1e-5)
+
+
+def test_embed_matrix_to_memmap(make_embedder, tmp_path):
+    embedder = make_embedder()
+    seqs = random_seqs(9, seed=6)
+    path = str(tmp_path / "embeddings.npy")
+
+    got = embedder.embed_matrix(seqs, batch_size=4, out_path=path)
+
+    assert isinstance(got, np.memmap)
+    np.testing.assert_array_equal(np.load(path, mmap_mode="r"), embedder.embed_matrix(seqs, batch_size=4))
+
+
+def test_empty_input(make_embedder):
+    embedder = make_embedder()
+    assert embedder.embed_matrix([]).shape == (0, 32)
+    assert embedder.embed_sequences([]) == []
+
+
+# ---------embedding cache---------
+def test_cached_sequences_are_not_embedded_again(make_embedder, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    seqs = random_seqs(10, seed=7)
+    first = make_embedder(cache_dir=cache_dir).embed_matrix(seqs[:6], batch_size=4)
+
+    embedder = make_embedder(cache_dir=cache_dir)
+    counter = ForwardCounter(embedder.model)
+    got = embedder.embed_matrix(seqs, batch_size=4)
+
+    assert sum(b for b, _ in counter.shapes) == 4
+    np.testing.assert_array_equal(got[:6], first)
+    np.testing.assert_allclose(got, reference(embedder, seqs), atol=1e-5)
+
+
+def test_cache_is_keyed_by_representation_layer(make_embedder, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    seqs = random_seqs(4, seed=8)
+    make_embedder(cache_dir=cache_dir, representation_layer="last").embed_matrix(seqs)
+
+    embedder = make_embedder(cache_dir=cache_dir, representation_layer=1)
+    counter = ForwardCounter(embedder.model)
+    got = embedder.embed_matrix(seqs)
+
+    assert sum(b for b, _ in counter.shapes) == 4
+    np.testing.assert_allclose(got, reference(embedder, seqs), atol=1e-5)
+
+
+# ---------sliding windows over long sequences---------
+def windowed_reference(embedder: AAChainEmbedder, seq: str, window: int, overlap: int) -> np.ndarray:
+    """Mean over residues of the per-residue mean over every window holding them."""
+    step = window - overlap
+    starts = list(range(0, max(len(seq) - window, 0) + step, step))
+    starts[-1] = max(len(seq) - window, 0)
+    total = torch.zeros(len(seq), embedder.model.config.hidden_size)
+    count = torch.zeros(len(seq), 1)
+    for start in dict.fromkeys(starts):
+        total[start:start + window] += residue_states(embedder, seq[start:start + window])
+        count[start:start + window] += 1
+    return (total / count).mean(0).numpy()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_window_starts_cover_the_sequence(seed):
+    rng = random.Random(seed)
+    window = rng.randint(2, 50)
+    overlap = rng.randint(0, window - 1)
+    length = rng.randint(1, 500)
+
+    starts = AAChainEmbedder._window_starts(length, window, overlap)
+
+    assert starts[0] == 0 and starts == sorted(set(starts))
+    assert starts[-1] + min(window, length) == length
+    assert all(b - a <= window - overlap for a, b in zip(starts, starts[1:]))
+
+
+@pytest.mark.parametrize("overlap", [0, 8, 31])
+def test_windowed_embedding_matches_reference(make_embedder, overlap):
+    embedder = make_embedder(max_positions=34, long_sequences="window", window_overlap=overlap)
+    seqs = random_seqs(12, lo=5, hi=150, seed=9)
+
+    got = embedder.embed_matrix(seqs, batch_size=5)
+
+    expected = np.stack([windowed_reference(embedder, s, 32, overlap) for s in seqs])
+    np.testing.assert_allclose(got, expected, atol=1e-5)
+
+
+def test_long_sequences_are_truncated_by_default(make_embedder):
+    embedder = make_embedder(max_positions=34)
+    seqs = random_seqs(6, lo=20, hi=100, seed=10)
+
+    got = embedder.embed_matrix(seqs)
+
+    np.testing.assert_allclose(got, reference(embedder, [s[:32] for s in seqs]), atol=1e-5)
+
+
+def test_window_overlap_must_leave_a_step(make_embedder):
+    with pytest.raises(ValueError, match="window_overlap"):
+        make_embedder(max_positions=34, long_sequences="window", window_overlap=32)
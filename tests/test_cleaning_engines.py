@@ -0,0 +1,47 @@
+"""The vectorized cleaning engine must reproduce the per-cell python engine."""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from M2F.cleaning_utils import AVAILABLE_EXTRACTION_PATTERNS, clean_cols
+
+PIECES = [
+    "DOMAIN 12..85", "DOMAIN: Kinase {ECO:0000255}", "FUNCTION: Binds ATP.",
+    "ACTIVITY REGULATION: Inhibited by Zn(2+).", "PATHWAY: Lipid metabolism; PATHWAY: X",
+    "Reaction=ATP + H2O = ADP;", "Name=Mg(2+);", "[GO:0005524]", "RHEA:12345", "2.7.11.1;",
+    "(PubMed:123)", "(PubMed:1, PubMed:22)", "{ECO:0000269|PubMed:456}", "P12345;",
+    "α-helix", "β-sheet", "Ca²⁺", "naïve", "µM", "½", "ﬁbre", "Ⅻ",
+    "--", "/", "_x_", "!", "...", " ", "  ", "\t", "\n", "\xa0", " ",
+]
+
+
+def random_cell(rng: random.Random):
+    roll = rng.random()
+    if roll < 0.1:
+        return np.nan
+    if roll < 0.12:
+        return None
+    return rng.choice(" ;").join(rng.choice(PIECES) for _ in range(rng.randint(1, 6)))
+
+
+def random_frame(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    columns = [*AVAILABLE_EXTRACTION_PATTERNS, "Unknown column"]
+    # repeat some cells so that deduplication of distinct values is exercised too
+    return pd.DataFrame({col: [random_cell(rng) for _ in range(n_rows // 2)] * 2 for col in columns})
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("apply_norm", [True, False])
+@pytest.mark.parametrize("apply_strip_pubmed", [True, False])
+def test_vectorized_matches_python(seed, apply_norm, apply_strip_pubmed):
+    df = random_frame(400, seed)
+    flags = lambda value: dict.fromkeys(df.columns, value)
+    kwargs = dict(apply_norms=flags(apply_norm), apply_strip_pubmeds=flags(apply_strip_pubmed))
+
+    expected = clean_cols(df, list(df.columns), engine="python", **kwargs)
+    actual   = clean_cols(df, list(df.columns), engine="vectorized", **kwargs)
+
+    pd.testing.assert_frame_equal(actual, expected)
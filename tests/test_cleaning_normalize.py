@@ -0,0 +1,76 @@
+"""`normalize` / `strip_pubmed` must match the plain regex chain they replaced."""
+import random
+import re
+import string
+
+import pytest
+
+from M2F.cleaning_utils import normalize, strip_pubmed
+
+# ---------baseline---------
+# the original implementations, kept verbatim as the reference
+
+def baseline_strip_pubmed(text: str) -> str:
+    text = re.sub(r"\s*\(PubMed:\d+(?:\s*,\s*PubMed:\d+)*\)", "", text)
+    text = re.sub(r"\s*\{[^}]*PubMed:[^}]*\}", "", text)
+    return re.sub(r"\s{2,}", " ", text).strip()
+
+
+def baseline_normalize(s: str) -> str:
+    s = s.strip()
+    s = re.sub(r"(^[^\w]+|[^\w]+$)", "", s)
+    s = re.sub(r"[^A-Za-z0-9\s\-/]", "", s)
+    s = re.sub(r"\s+", " ", s)
+    return s.lower()
+
+# ---------random-inputs---------
+
+ASCII_CHARS   = string.ascii_letters + string.digits + string.punctuation
+WHITESPACE    = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+UNICODE_CHARS = "éÉüßøµ½²³αβΩ€Ⅻﬁ٣\xa0  　​_"
+PUBMED_PIECES = [
+    "(PubMed:123)", " (PubMed:1, PubMed:22)", "(PubMed:7 ,PubMed:8)", "{ECO:0000269|PubMed:456}",
+    " {PubMed:9}", "PubMed:", "(PubMed:)", "(PubMed:12", "{PubMed:3", "PubMed:42",
+]
+
+
+def random_text(rng: random.Random, ascii_only: bool) -> str:
+    alphabet = ASCII_CHARS + WHITESPACE * 3 + ("" if ascii_only else UNICODE_CHARS)
+    parts = []
+    for _ in range(rng.randint(0, 8)):
+        roll = rng.random()
+        if roll < 0.25:
+            parts.append(rng.choice(PUBMED_PIECES))
+        elif roll < 0.45:
+            parts.append(rng.choice(WHITESPACE) * rng.randint(2, 4))
+        else:
+            parts.append("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))))
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("ascii_only", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_strip_pubmed_matches_baseline(seed, ascii_only):
+    rng = random.Random(seed)
+    for _ in range(2_000):
+        text = random_text(rng, ascii_only)
+        assert strip_pubmed(text) == baseline_strip_pubmed(text), repr(text)
+
+
+@pytest.mark.parametrize("ascii_only", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_normalize_matches_baseline(seed, ascii_only):
+    rng = random.Random(seed)
+    for _ in range(2_000):
+        text = random_text(rng, ascii_only)
+        assert normalize(text) == baseline_normalize(text), repr(text)
+
+
+@pytest.mark.parametrize("text", [
+    "", " ", "  \t\n ", "PubMed:", "abc", "A  B", "a\x1cb", "-/-", "__x__", "Ca²⁺", "naïve  (PubMed:1)",
+    "Binds ATP (PubMed:1, PubMed:2).  Also Mg {ECO:0000269|PubMed:3}.", "\xa0x\xa0", "x​y",
+])
+def test_edge_cases_match_baseline(text):
+    assert strip_pubmed(text) == baseline_strip_pubmed(text)
+    assert normalize(text) == baseline_normalize(text)
+    assert normalize(strip_pubmed(text)) == baseline_normalize(baseline_strip_pubmed(text))
@@ -0,0 +1,82 @@
+"""SequenceEmbeddingCache round trips and recovery from interrupted writes."""
+import os
+
+import numpy as np
+import pytest
+
+from M2F.embedding_utils import SequenceEmbeddingCache
+
+DIM = 8
+
+
+def vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SequenceEmbeddingCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_get_returns_hits_in_input_order(cache):
+    seqs = ["MKV", "AAAA", "GG"]
+    vecs = vectors(3)
+    assert cache.put("ns", seqs, vecs) == 3
+
+    hit, found = cache.get("ns", ["GG", "unknown", "MKV", "GG"], DIM)
+    assert hit.tolist() == [True, False, True, True]
+    np.testing.assert_array_equal(found, vecs[[2, 0, 2]])
+
+
+def test_put_skips_cached_and_duplicate_sequences(cache):
+    vecs = vectors(3)
+    assert cache.put("ns", ["A", "B", "A"], vecs) == 2
+    assert cache.put("ns", ["B", "C"], vecs[:2]) == 1
+    assert len(cache) == 3
+
+    _, found = cache.get("ns", ["A", "B", "C"], DIM)
+    np.testing.assert_array_equal(found, vecs[[0, 1, 1]])
+
+
+def test_namespaces_are_separate(cache):
+    cache.put("a", ["MKV"], vectors(1, seed=1))
+    hit, found = cache.get("b", ["MKV"], DIM)
+    assert not hit.any() and found.shape == (0, DIM)
+
+
+def test_dimension_mismatch_raises(cache):
+    cache.put("ns", ["MKV"], vectors(1))
+    with pytest.raises(ValueError, match="8-d"):
+        cache.get("ns", ["MKV"], DIM + 1)
+
+
+def test_persists_across_instances(tmp_path):
+    vecs = vectors(2)
+    first = SequenceEmbeddingCache(str(tmp_path))
+    first.put("ns", ["MKV", "GG"], vecs)
+    first.close()
+
+    second = SequenceEmbeddingCache(str(tmp_path))
+    hit, found = second.get("ns", ["GG", "MKV"], DIM)
+    second.close()
+    assert hit.all()
+    np.testing.assert_array_equal(found, vecs[[1, 0]])
+
+
+def test_torn_trailing_row_is_ignored_then_truncated(cache):
+    vecs = vectors(3)
+    cache.put("ns", ["A", "B"], vecs[:2])
+    path = cache._vector_path("ns")
+    with open(path, "ab") as f: # an interrupted append leaves part of a row behind
+        f.write(b"\x01" * 8)
+
+    hit, found = cache.get("ns", ["A", "B"], DIM)
+    assert hit.all()
+    np.testing.assert_array_equal(found, vecs[:2])
+
+    assert cache.put("ns", ["C"], vecs[2:]) == 1
+    assert os.path.getsize(path) == 3 * DIM * 4
+    _, found = cache.get("ns", ["C", "A", "B"], DIM)
+    np.testing.assert_array_equal(found, vecs[[2, 0, 1]])
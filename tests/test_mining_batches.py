@@ -0,0 +1,107 @@
+"""Checkpointed batch downloads: manifest bookkeeping and resuming interrupted runs."""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from mock_uniprot_server import synthetic_accessions
+
+import M2F.mining_utils as mining_utils
+from M2F.mining_utils import MANIFEST_FILE_NAME, fetch_save_uniprotkb_batches
+
+FIELDS = ["accession", "length", "cc_function"]
+
+
+def run(ids, client, save_to_dir, **kwargs):
+    return fetch_save_uniprotkb_batches(ids, FIELDS, batch_size=40, single_api_request_size=20, rps=1000,
+                                        save_to_dir=str(save_to_dir), client=client, **kwargs)
+
+
+def load_manifest(save_to_dir):
+    with open(os.path.join(save_to_dir, MANIFEST_FILE_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_batches(save_to_dir):
+    manifest = load_manifest(save_to_dir)
+    files = [f for _, entry in sorted(manifest["batches"].items(), key=lambda kv: int(kv[0]))
+             for f in entry["files"]]
+    return pd.concat([pd.read_parquet(os.path.join(save_to_dir, f)) for f in files], ignore_index=True)
+
+
+def test_manifest_records_every_batch(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(100, seed=5)
+    run(ids, uniprot_client, tmp_path)
+
+    manifest = load_manifest(tmp_path)
+    assert (manifest["fields"], manifest["batch_size"], manifest["total_ids"]) == (FIELDS, 40, 100)
+    assert [(e["start"], e["end"], e["first_id"], e["last_id"], e["status"], e["rows"])
+            for e in manifest["batches"].values()] == [
+        (0, 40, ids[0], ids[39], "completed", 40),
+        (40, 80, ids[40], ids[79], "completed", 40),
+        (80, 100, ids[80], ids[99], "completed", 20),
+    ]
+    assert read_batches(tmp_path)["Entry"].tolist() == ids
+
+
+def test_resume_skips_completed_batches(uniprot_server, uniprot_client, tmp_path, monkeypatch):
+    ids = synthetic_accessions(100, seed=6)
+    original = mining_utils._fetch_uniprotkb_fields
+    calls = []
+
+    def interrupted(to_fetch, *args, **kwargs):
+        if to_fetch == ids[40:80]:
+            raise RuntimeError("interrupted")
+        return original(to_fetch, *args, **kwargs)
+
+    def recorded(to_fetch, *args, **kwargs):
+        calls.append(to_fetch)
+        return original(to_fetch, *args, **kwargs)
+
+    monkeypatch.setattr(mining_utils, "_fetch_uniprotkb_fields", interrupted)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        run(ids, uniprot_client, tmp_path)
+    assert list(load_manifest(tmp_path)["batches"]) == ["1"]
+
+    monkeypatch.setattr(mining_utils, "_fetch_uniprotkb_fields", recorded)
+    run(ids, uniprot_client, tmp_path, resume=True)
+    assert calls == [ids[40:80], ids[80:]]
+    assert read_batches(tmp_path)["Entry"].tolist() == ids
+
+
+def test_resume_retries_only_failed_ids(uniprot_server, uniprot_client, tmp_path, monkeypatch):
+    ids = synthetic_accessions(80, seed=7)
+    lost = set(ids[10:15])
+    original = mining_utils._fetch_uniprotkb_fields
+
+    def flaky(to_fetch, *args, **kwargs):
+        kept = [uid for uid in to_fetch if uid not in lost]
+        df, failed, invalid = original(kept, *args, **kwargs)
+        return df, failed + [uid for uid in to_fetch if uid in lost], invalid
+
+    monkeypatch.setattr(mining_utils, "_fetch_uniprotkb_fields", flaky)
+    run(ids, uniprot_client, tmp_path)
+    entry = load_manifest(tmp_path)["batches"]["1"]
+    assert (entry["status"], entry["rows"], entry["failed_ids"]) == ("partial", 35, ids[10:15])
+
+    monkeypatch.setattr(mining_utils, "_fetch_uniprotkb_fields", original)
+    uniprot_server.reset_stats()
+    run(ids, uniprot_client, tmp_path, resume=True)
+
+    entry = load_manifest(tmp_path)["batches"]["1"]
+    assert (entry["status"], entry["rows"], entry["failed_ids"]) == ("completed", 40, [])
+    assert entry["files"] == ["batch_1.parquet", "batch_1_retry1.parquet"]
+    assert uniprot_server.stats["rows"] == 5
+    assert sorted(read_batches(tmp_path)["Entry"]) == sorted(ids)
+
+
+def test_resume_rejects_a_different_run(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(80, seed=8)
+    run(ids, uniprot_client, tmp_path)
+
+    with pytest.raises(ValueError, match="different run"):
+        fetch_save_uniprotkb_batches(ids, FIELDS, batch_size=20, rps=1000, save_to_dir=str(tmp_path),
+                                     client=uniprot_client, resume=True)
+    with pytest.raises(ValueError, match="same order"):
+        run(ids[::-1], uniprot_client, tmp_path, resume=True)
@@ -0,0 +1,110 @@
+"""Partitioned Parquet dataset output of fetch_save_uniprotkb_batches."""
+import glob
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from mock_uniprot_server import synthetic_accessions
+
+from M2F.mining_utils import (
+    DATASET_DIR_NAME,
+    MANIFEST_FILE_NAME,
+    _write_dataset_batch,
+    fetch_save_uniprotkb_batches,
+    fetch_uniprotkb_fields,
+    read_uniprotkb_dataset,
+    uniprotkb_dataset_prefixes,
+)
+
+FIELDS = ["accession", "length", "go_f", "cc_function"]
+
+
+def run(ids, client, save_to_dir, **kwargs):
+    return fetch_save_uniprotkb_batches(ids, FIELDS, batch_size=100, single_api_request_size=50, rps=1000,
+                                        save_to_dir=str(save_to_dir), client=client, output="dataset",
+                                        dataset_prefix_length=6, **kwargs)
+
+
+def parquet_files(dataset_dir):
+    return sorted(glob.glob(os.path.join(dataset_dir, "**", "*.parquet"), recursive=True))
+
+
+def test_dataset_matches_a_direct_download(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(250, seed=30)
+    run(ids, uniprot_client, tmp_path)
+    dataset_dir = str(tmp_path / DATASET_DIR_NAME)
+
+    df = read_uniprotkb_dataset(dataset_dir)
+    direct = fetch_uniprotkb_fields(ids, FIELDS, rps=1000, client=uniprot_client)
+    # missing strings come back as None rather than NaN
+    direct = direct.astype(object).where(direct.notna(), None)
+    pd.testing.assert_frame_equal(
+        df.sort_values("Entry").reset_index(drop=True),
+        direct.sort_values("Entry").reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert str(df["Length"].dtype) == "int64"
+    assert uniprotkb_dataset_prefixes(dataset_dir) == ["Q00000", "Q00001", "Q00002"]
+
+
+@pytest.mark.parametrize("prefixes", [["Q00001"], ["Q000012", "Q00002"], ["Q0"]])
+def test_prefix_filter(uniprot_server, uniprot_client, tmp_path, prefixes):
+    ids = synthetic_accessions(250, seed=31)
+    run(ids, uniprot_client, tmp_path)
+
+    df = read_uniprotkb_dataset(str(tmp_path / DATASET_DIR_NAME), accession_prefixes=prefixes)
+    assert sorted(df["Entry"]) == sorted(uid for uid in ids if uid.startswith(tuple(prefixes)))
+
+
+def test_rerun_replaces_the_files_of_a_batch(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(250, seed=32)
+    run(ids, uniprot_client, tmp_path)
+    dataset_dir = str(tmp_path / DATASET_DIR_NAME)
+    files = parquet_files(dataset_dir)
+
+    # forget batch 2, as if the run stopped after writing it but before updating the manifest
+    manifest_path = str(tmp_path / MANIFEST_FILE_NAME)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    del manifest["batches"]["2"]
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    run(ids, uniprot_client, tmp_path, resume=True)
+
+    assert parquet_files(dataset_dir) == files
+    df = read_uniprotkb_dataset(dataset_dir)
+    assert len(df) == df["Entry"].nunique() == len(ids)
+
+
+def test_stale_files_of_a_stem_are_removed(tmp_path):
+    dataset_dir = str(tmp_path)
+    first = pa.table({"Entry": ["A00001", "B00001", "C00001"], "Length": pa.array([1, 2, 3], pa.int64())})
+    second = pa.table({"Entry": ["B00002"], "Length": pa.array([4], pa.int64())})
+    other = pa.table({"Entry": ["A00003"], "Length": pa.array([5], pa.int64())})
+
+    _write_dataset_batch(first, dataset_dir, "batch_1", "Entry", 1)
+    _write_dataset_batch(other, dataset_dir, "batch_2", "Entry", 1)
+    written = _write_dataset_batch(second, dataset_dir, "batch_1", "Entry", 1)
+
+    assert written == [os.path.join(dataset_dir, "accession_prefix=B", "batch_1-0.parquet")]
+    assert [os.path.relpath(f, dataset_dir) for f in parquet_files(dataset_dir)] == [
+        os.path.join("accession_prefix=A", "batch_2-0.parquet"),
+        os.path.join("accession_prefix=B", "batch_1-0.parquet"),
+    ]
+    assert sorted(read_uniprotkb_dataset(dataset_dir)["Entry"]) == ["A00003", "B00002"]
+
+
+def test_refuses_to_mix_with_an_earlier_run(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(120, seed=33)
+    run(ids, uniprot_client, tmp_path)
+    with pytest.raises(ValueError, match="already holds data"):
+        run(ids, uniprot_client, tmp_path)
+
+
+def test_requires_the_accession_field(uniprot_client, tmp_path):
+    with pytest.raises(ValueError, match="accession"):
+        fetch_save_uniprotkb_batches(["Q0000001"], ["length"], batch_size=10, save_to_dir=str(tmp_path),
+                                     client=uniprot_client, output="dataset")
@@ -0,0 +1,64 @@
+"""The ID-mapping engine must return what OR-joined search queries return."""
+import pandas as pd
+import pytest
+
+from mock_uniprot_server import synthetic_accessions
+
+import M2F.mining_utils as mining_utils
+from M2F.mining_utils import fetch_uniprotkb_fields, fetch_uniprotkb_fields_to_parquet
+
+FIELDS = ["accession", "length", "go_f", "cc_function"]
+
+
+def fetch(ids, client, engine, request_size, **kwargs):
+    return fetch_uniprotkb_fields(ids, FIELDS, request_size=request_size, rps=1000,
+                                  client=client, engine=engine, **kwargs)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_idmapping_matches_search(uniprot_server, uniprot_client, max_workers):
+    ids = synthetic_accessions(230, seed=1)
+    search = fetch(ids, uniprot_client, "search", 50, max_workers=max_workers)
+    mapped = fetch(ids, uniprot_client, "idmapping", 230, max_workers=max_workers)
+
+    assert search["Entry"].tolist() == ids
+    pd.testing.assert_frame_equal(mapped, search)
+
+
+def test_idmapping_follows_cursor_pages(uniprot_server, uniprot_client, monkeypatch):
+    original = mining_utils._idmapping_request
+    monkeypatch.setattr(mining_utils, "_idmapping_request",
+                        lambda *args, **kwargs: original(*args, **kwargs, page_size=40))
+    ids = synthetic_accessions(130, seed=2)
+    df = fetch(ids, uniprot_client, "idmapping", 130)
+
+    assert df["Entry"].tolist() == ids
+    # one run, one status poll and ceil(130 / 40) result pages
+    assert uniprot_server.stats["requests"] == 2 + 4
+
+
+def test_idmapping_drops_unmapped_ids(uniprot_server, uniprot_client):
+    ids = synthetic_accessions(120, seed=3)
+    uniprot_server.configure(missing_rate=0.2)
+    df = fetch(ids, uniprot_client, "idmapping", 120)
+
+    expected = fetch(ids, uniprot_client, "search", 40)
+    assert 0 < len(df) < len(ids)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_idmapping_streams_to_parquet(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(150, seed=4)
+    path = str(tmp_path / "mapped.parquet")
+    rows = fetch_uniprotkb_fields_to_parquet(ids, FIELDS, path, request_size=150, rps=1000,
+                                             client=uniprot_client, engine="idmapping")
+
+    df = pd.read_parquet(path)
+    assert rows == len(df) == len(ids)
+    assert sorted(df["Entry"]) == sorted(ids)
+    assert str(df["Length"].dtype) == "int64"
+
+
+def test_idmapping_rejects_oversized_requests(uniprot_client):
+    with pytest.raises(ValueError, match="idmapping"):
+        fetch(["Q0000001"], uniprot_client, "idmapping", 100_001)
@@ -0,0 +1,66 @@
+"""Bisection of rejected requests and the quarantine of invalid accessions."""
+import os
+
+import pytest
+
+from mock_uniprot_server import synthetic_accessions
+
+from M2F.mining_utils import fetch_uniprotkb_fields
+
+FIELDS = ["accession", "length"]
+
+
+def fetch(ids, client, fields=FIELDS, **kwargs):
+    kwargs.setdefault("request_size", 50)
+    return fetch_uniprotkb_fields(ids, fields, rps=1000, client=client, **kwargs)
+
+
+def read_quarantine(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().split()
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_invalid_ids_are_isolated_and_quarantined(uniprot_server, uniprot_client, tmp_path, max_workers):
+    ids = synthetic_accessions(200, seed=20, invalid_fraction=0.05)
+    invalid = [uid for uid in ids if uid.startswith("BAD")]
+    quarantine = str(tmp_path / "quarantine.txt")
+
+    df = fetch(ids, uniprot_client, max_workers=max_workers, quarantine_path=quarantine)
+    assert df["Entry"].tolist() == [uid for uid in ids if uid not in invalid]
+    assert sorted(read_quarantine(quarantine)) == sorted(invalid)
+
+    uniprot_server.reset_stats()
+    again = fetch(ids, uniprot_client, max_workers=max_workers, quarantine_path=quarantine)
+    assert again.equals(df)
+    assert uniprot_server.stats["status_400"] == 0
+
+
+def test_bisection_needs_logarithmically_many_requests(uniprot_server, uniprot_client):
+    ids = synthetic_accessions(16, seed=21)
+    ids[11] = "BAD0000011"
+
+    df = fetch(ids, uniprot_client, request_size=16)
+    assert df["Entry"].tolist() == ids[:11] + ids[12:]
+    # the full batch, then both halves at each of the four bisection levels
+    assert uniprot_server.stats["requests"] == 1 + 2 * 4
+
+
+def test_max_retry_caps_bisection(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(16, seed=22)
+    ids[3] = "BAD0000003"
+    quarantine = str(tmp_path / "quarantine.txt")
+
+    df = fetch(ids, uniprot_client, request_size=16, max_retry=1, quarantine_path=quarantine)
+    assert df["Entry"].tolist() == ids[8:]
+    assert not os.path.exists(quarantine)
+
+
+def test_rejected_fields_are_not_blamed_on_the_ids(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(8, seed=23)
+    quarantine = str(tmp_path / "quarantine.txt")
+
+    df = fetch(ids, uniprot_client, fields=["accession", "not a field"], request_size=4,
+               quarantine_path=quarantine)
+    assert df.empty
+    assert not os.path.exists(quarantine)
@@ -0,0 +1,74 @@
+"""UniProtRecordStore: only what it lacks is downloaded, and results match a direct download."""
+import pandas as pd
+import pytest
+
+from mock_uniprot_server import synthetic_accessions
+
+from M2F.mining_utils import UniProtRecordStore, fetch_uniprotkb_fields
+
+FIELDS = ["accession", "length", "go_f", "cc_function"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with UniProtRecordStore(str(tmp_path / "records.sqlite")) as store:
+        yield store
+
+
+def fetch(ids, fields, client, **kwargs):
+    return fetch_uniprotkb_fields(ids, fields, request_size=25, rps=1000, client=client, **kwargs)
+
+
+def test_cached_records_match_a_direct_download(uniprot_server, uniprot_client, store):
+    ids = synthetic_accessions(60, seed=10)
+    direct = fetch(ids, FIELDS, uniprot_client)
+
+    first = fetch(ids[:40], FIELDS, uniprot_client, store=store)
+    uniprot_server.reset_stats()
+    second = fetch(ids, FIELDS, uniprot_client, store=store)
+
+    assert uniprot_server.stats["rows"] == 20
+    pd.testing.assert_frame_equal(first, direct.iloc[:40])
+    pd.testing.assert_frame_equal(second, direct)
+
+
+def test_only_missing_fields_are_requested(uniprot_server, uniprot_client, store, monkeypatch):
+    ids = synthetic_accessions(30, seed=11)
+    fetch(ids, ["accession", "length"], uniprot_client, store=store)
+
+    requested = []
+    original = uniprot_client.get
+
+    def recording_get(endpoint, **kwargs):
+        requested.append(kwargs["params"]["fields"])
+        return original(endpoint, **kwargs)
+
+    monkeypatch.setattr(uniprot_client, "get", recording_get)
+    df = fetch(ids, FIELDS, uniprot_client, store=store)
+
+    assert set(requested) == {"accession,go_f,cc_function"}
+    pd.testing.assert_frame_equal(df, fetch(ids, FIELDS, uniprot_client))
+
+
+def test_releases_are_kept_apart(uniprot_server, uniprot_client, tmp_path):
+    ids = synthetic_accessions(20, seed=12)
+    path = str(tmp_path / "records.sqlite")
+    with UniProtRecordStore(path, release="2024_01") as store:
+        fetch(ids, FIELDS, uniprot_client, store=store)
+    with UniProtRecordStore(path, release="2024_02") as store:
+        assert store.lookup(ids, FIELDS) == {}
+        uniprot_server.reset_stats()
+        fetch(ids, FIELDS, uniprot_client, store=store)
+    assert uniprot_server.stats["rows"] == 20
+
+
+def test_invalid_ids_are_not_requested_again(uniprot_server, uniprot_client, store):
+    ids = ["Q0000001", "BAD0000002", "Q0000003", "BAD0000004"]
+    df = fetch(ids, FIELDS, uniprot_client, store=store)
+    assert df["Entry"].tolist() == ["Q0000001", "Q0000003"]
+    assert store.invalid(ids) == {"BAD0000002", "BAD0000004"}
+
+    uniprot_server.reset_stats()
+    again = fetch(ids, FIELDS, uniprot_client, store=store)
+    assert uniprot_server.stats["requests"] == 0
+    pd.testing.assert_frame_equal(again, df)
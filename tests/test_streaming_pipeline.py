@@ -0,0 +1,140 @@
+"""StreamingPreprocessor: processing a file chunk by chunk must equal one whole-frame run."""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import M2F
+
+GO_TERMS = [
+    "hydrolase activity [GO:0016787]", "protein binding [GO:0005515]", "binding [GO:0005488]",
+    "hydrolase activity, acting on ester bonds [GO:0016788]", "catalytic activity [GO:0003824]",
+]
+COFACTORS = ["Mg(2+)", "Zn(2+)", "FAD", "heme b"]
+CLEAN_COLS = ["Domain [FT]", "Gene Ontology (molecular function)", "Function [CC]", "EC number", "Cofactor",
+              "Sequence"]
+APPLY_NORMS = {col: col == "Function [CC]" for col in CLEAN_COLS}
+
+
+class FakeAAEmbedder:
+    """Deterministic stand-in for AAChainEmbedder."""
+    model = SimpleNamespace(config=SimpleNamespace(hidden_size=8))
+
+    def embed_sequences(self, seqs, batch_size=32):
+        return [np.arange(8, dtype=np.float32) + sum(map(ord, s)) % 97 for s in seqs]
+
+
+class FakeTXTEmbedder:
+    """Deterministic stand-in for FreeTXTEmbedder."""
+    model = "text-embedding-3-small"
+
+    def embed_sequences(self, seqs, batch_size=1000):
+        return [np.full(1536, len(s), dtype=np.float32) for s in seqs]
+
+
+def maybe(rng, p_missing, make):
+    return np.nan if rng.random() < p_missing else make()
+
+
+def random_frame(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        rows.append({
+            "Entry": f"P{i:05d}",
+            "Domain [FT]": maybe(rng, 0.3, lambda: f'DOMAIN {rng.randint(1, 20)}..{rng.randint(21, 50)}; /note="x"'),
+            "Gene Ontology (molecular function)": maybe(rng, 0.1, lambda: "; ".join(rng.sample(GO_TERMS, rng.randint(1, 3)))),
+            "Function [CC]": maybe(rng, 0.1, lambda: f"FUNCTION: Binds {rng.choice(COFACTORS)} (PubMed:{rng.randrange(10**6)})."),
+            "EC number": maybe(rng, 0.2, lambda: "; ".join(f"{rng.randint(1, 7)}.{rng.randint(1, 3)}.{rng.choice(['1', '-'])}.{rng.randint(1, 9)}"
+                                                           for _ in range(rng.randint(1, 2)))),
+            "Cofactor": maybe(rng, 0.3, lambda: f"COFACTOR: Name={rng.choice(COFACTORS)}; Xref=ChEBI:CHEBI:{rng.randrange(99999)};"),
+            "Sequence": "".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=rng.randint(50, 300))),
+            "Protein families": "not read",
+        })
+    return pd.DataFrame(rows)
+
+
+def whole_frame_run(df: pd.DataFrame, tmp_path):
+    df = df.drop(columns=["Protein families"])
+    M2F.clean_cols(df, CLEAN_COLS, apply_norms=APPLY_NORMS, inplace=True)
+    M2F.embed_ft_domains(df, FakeAAEmbedder(), inplace=True)
+    M2F.embed_AAsequences(df, FakeAAEmbedder(), inplace=True)
+    M2F.embed_freetxt_cols(df, ["Function [CC]"], FakeTXTEmbedder(), inplace=True)
+    _, go_labels = M2F.encode_go(df, "Gene Ontology (molecular function)", coverage_target=0.8, inplace=True)
+    _, ec_labels = M2F.encode_ec(df, "EC number", inplace=True)
+    _, cofactor_labels = M2F.encode_multihot(df, "Cofactor", inplace=True)
+    path = str(tmp_path / "whole.zip")
+    M2F.save_df(df, path)
+    return M2F.load_df(path), (go_labels, ec_labels, cofactor_labels)
+
+
+def make_preprocessor(**kwargs) -> M2F.StreamingPreprocessor:
+    return M2F.StreamingPreprocessor(
+        CLEAN_COLS, apply_norms=APPLY_NORMS, aa_embedder=FakeAAEmbedder(), txt_embedder=FakeTXTEmbedder(),
+        freetxt_cols=["Function [CC]"], go_cols=["Gene Ontology (molecular function)"], ec_cols=["EC number"],
+        multihot_cols=["Cofactor"], **kwargs
+    )
+
+
+def assert_same_frame(expected: pd.DataFrame, got: pd.DataFrame):
+    assert list(got.columns) == list(expected.columns)
+    for col in expected.columns:
+        for a, b in zip(expected[col], got[col]):
+            if isinstance(a, np.ndarray):
+                np.testing.assert_array_equal(a, b)
+            elif isinstance(a, tuple):
+                assert a == b, (col, a, b)
+            else:
+                assert (pd.isna(a) and pd.isna(b)) or a == b, (col, a, b)
+
+
+@pytest.mark.parametrize("source", ["csv", "parquet"])
+@pytest.mark.parametrize("output", ["tuple", "arrow", "codes"])
+def test_chunked_run_matches_whole_frame_run(tmp_path, source, output):
+    path = str(tmp_path / f"batch.{source}")
+    if source == "csv":
+        random_frame(257, seed=0).to_csv(path, index=False)
+        df = pd.read_csv(path)
+    else:
+        random_frame(257, seed=0).to_parquet(path)
+        df = pd.read_parquet(path)
+    expected, (go_labels, ec_labels, cofactor_labels) = whole_frame_run(df, tmp_path)
+
+    pre = make_preprocessor(chunk_rows=40, output=output)
+    parts = pre.fit_transform(path, str(tmp_path / "out"))
+    got = M2F.load_streamed_df(str(tmp_path / "out"))
+
+    assert len(parts) == 7
+    assert pre.encoders_meta["Gene Ontology (molecular function)"]["class_labels"] == go_labels
+    assert pre.encoders_meta["EC number"]["class_labels"] == ec_labels
+    assert pre.encoders_meta["Cofactor"]["class_labels"] == cofactor_labels
+    assert_same_frame(expected, got)
+
+
+def test_rerun_skips_written_parts(tmp_path, monkeypatch):
+    path = str(tmp_path / "batch.csv")
+    random_frame(100, seed=1).to_csv(path, index=False)
+    pre = make_preprocessor(chunk_rows=30)
+    parts = pre.fit_transform(path, str(tmp_path / "out"))
+
+    monkeypatch.setattr(pre, "_process", lambda chunk: pytest.fail("a written part was processed again"))
+    assert pre.transform(path, str(tmp_path / "out")) == parts
+
+
+def test_rerun_with_another_chunk_size_is_rejected(tmp_path):
+    path = str(tmp_path / "batch.csv")
+    random_frame(60, seed=2).to_csv(path, index=False)
+    pre = make_preprocessor(chunk_rows=30)
+    pre.fit_transform(path, str(tmp_path / "out"))
+
+    other = make_preprocessor(chunk_rows=20)
+    other.encoders_meta = pre.encoders_meta
+    with pytest.raises(ValueError, match="different run"):
+        other.transform(path, str(tmp_path / "out"))
+
+
+def test_every_column_needs_a_stage():
+    with pytest.raises(ValueError, match="No embedding or encoding stage"):
+        M2F.StreamingPreprocessor(["Sequence", "Pathway"], aa_embedder=FakeAAEmbedder())